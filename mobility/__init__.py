@@ -0,0 +1,9 @@
+# @author    Muzaffer Citir
+# @date      2026.10.18
+# @location  Berlin, Germany
+# @version   1.0
+
+# @brief   Helper modules used by run.py to prepare, run and post-process a game round.
+#
+# Submodules are imported explicitly by their users (e.g. `from mobility import parsers`),
+# so importing the package itself stays cheap.
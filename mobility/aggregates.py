@@ -0,0 +1,136 @@
+# @author    Muzaffer Citir
+# @date      2026.10.18
+# @location  Berlin, Germany
+# @version   1.0
+
+# @brief   Per-edge aggregates of the edge statistics over all rounds, updated at the end of every round.
+#
+# For every edge and metric the file keeps the number of rounds with a value, the running mean and
+# the sum of squared deviations (Welford), min, max, the value of the latest round and an EWMA.
+# One update touches one row per edge, so its cost and the size of the file do not grow with the
+# number of rounds. Edges without traffic are not written by SUMO (excludeEmpty) and simply get no
+# new value in that round.
+
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+AGGREGATES_FILE = 'store/edge_aggregates.parquet'
+
+# Table of the store -> metrics which are aggregated
+METRICS = {'dump_edges': ['density', 'speed', 'timeLoss'], 'dump_edges_co2': ['CO2_abs', 'CO2_normed']}
+
+# Metrics which are totals of an interval; with several edgeData intervals in a round these are
+# summed per edge, the others averaged
+SUMMED_METRICS = {'timeLoss', 'CO2_abs'}
+
+# Weight of the latest round in the EWMA
+EWMA_ALPHA = 0.3
+
+
+def round_metrics(tables):
+    """metric values of one round, one row per edge, also when the round has several intervals"""
+    frames = []
+    for table, metrics in METRICS.items():
+        # A round without traffic has no <edge> rows with excludeEmpty, so no metric columns either
+        df = tables[table].reindex(columns=['id'] + metrics)
+        values = pd.DataFrame({metric: pd.to_numeric(df[metric], errors='coerce').values for metric in metrics},
+                              index=pd.Index(df['id'].astype(str).values, name='id'))
+        grouped = values.groupby(level='id', sort=False)
+        frames.append(pd.concat([grouped[metric].sum(min_count=1) if metric in SUMMED_METRICS
+                                 else grouped[metric].mean() for metric in metrics], axis=1))
+    return pd.concat(frames, axis=1)
+
+
+class EdgeAggregates(object):
+    """running statistics of the edge metrics over all rounds, stored in one small Parquet file"""
+
+    def __init__(self, aggregates_file=AGGREGATES_FILE, alpha=EWMA_ALPHA):
+        self.aggregates_file = aggregates_file
+        self.alpha = alpha
+
+    def exists(self):
+        return os.path.exists(self.aggregates_file)
+
+    def load(self):
+        """(aggregates indexed by edge id, latest HasRun included) or (None, 0)"""
+        if not self.exists():
+            return None, 0
+        arrow_table = pq.read_table(self.aggregates_file)
+        has_run = int(arrow_table.schema.metadata[b'HasRun'])
+        return arrow_table.to_pandas().set_index('id'), has_run
+
+    def save(self, df, has_run):
+        directory = os.path.dirname(self.aggregates_file)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        arrow_table = pa.Table.from_pandas(df.reset_index(), preserve_index=False)
+        # The latest round goes into the file metadata, so a round is never counted twice
+        arrow_table = arrow_table.replace_schema_metadata(dict(arrow_table.schema.metadata or {},
+                                                               HasRun=str(has_run)))
+        pq.write_table(arrow_table, self.aggregates_file + '.tmp', compression='zstd')
+        os.replace(self.aggregates_file + '.tmp', self.aggregates_file)
+
+    def update(self, tables, has_run):
+        """add round has_run to the aggregates, return False if it is already included
+
+        A round which is already included may have been run again and replaced in the store, so the
+        caller then rebuilds the aggregates from the store.
+        """
+        df, aggregated_run = self.load()
+        if has_run <= aggregated_run:
+            return False
+        values = round_metrics(tables)
+        if df is None:
+            df = pd.DataFrame(index=pd.Index([], name='id'))
+        df = df.reindex(df.index.union(values.index))
+        values = values.reindex(df.index)
+        for metric in values.columns:
+            x = values[metric].values
+            observed = ~np.isnan(x)
+            count = df.get(f'{metric}_count', pd.Series(0, index=df.index)).fillna(0).values
+            mean = df.get(f'{metric}_mean', pd.Series(np.nan, index=df.index)).values
+            m2 = df.get(f'{metric}_m2', pd.Series(np.nan, index=df.index)).values
+            minimum = df.get(f'{metric}_min', pd.Series(np.nan, index=df.index)).values
+            maximum = df.get(f'{metric}_max', pd.Series(np.nan, index=df.index)).values
+            ewma = df.get(f'{metric}_ewma', pd.Series(np.nan, index=df.index)).values
+            first = observed & (count == 0)
+
+            new_count = count + observed
+            delta = x - np.where(first, 0.0, mean)
+            new_mean = np.where(first, x, mean + delta / np.maximum(new_count, 1))
+            new_m2 = np.where(first, 0.0, m2 + delta * (x - new_mean))
+            df[f'{metric}_count'] = new_count.astype('int64')
+            df[f'{metric}_mean'] = np.where(observed, new_mean, mean)
+            df[f'{metric}_m2'] = np.where(observed, new_m2, m2)
+            df[f'{metric}_min'] = np.where(observed, np.fmin(minimum, x), minimum)
+            df[f'{metric}_max'] = np.where(observed, np.fmax(maximum, x), maximum)
+            df[f'{metric}_last'] = x
+            df[f'{metric}_ewma'] = np.where(observed, np.where(first, x, self.alpha * x + (1 - self.alpha) * ewma),
+                                            ewma)
+        df['lastSeen'] = np.where(values.notna().any(axis=1).values, has_run, df.get('lastSeen', np.nan))
+        self.save(df, has_run)
+        return True
+
+    def rebuild(self, store):
+        """aggregate all rounds of the store from scratch"""
+        if self.exists():
+            os.remove(self.aggregates_file)
+        for has_run in store.rounds('dump_edges'):
+            self.update({table: store.read(table, has_run) for table in METRICS}, has_run)
+
+    def read(self, edges=None):
+        """aggregates per edge with the variance, optionally only of the given edge ids"""
+        df, has_run = self.load()
+        if df is None:
+            return None
+        if edges is not None:
+            df = df.loc[df.index.intersection(edges)]
+        for metric in [metric for metrics in METRICS.values() for metric in metrics]:
+            count = df[f'{metric}_count']
+            df[f'{metric}_var'] = (df[f'{metric}_m2'] / (count - 1)).where(count > 1)
+        df.attrs['HasRun'] = has_run
+        return df
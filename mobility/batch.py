@@ -0,0 +1,112 @@
+# @author    Muzaffer Citir
+# @date      2026.10.18
+# @location  Berlin, Germany
+# @version   1.0
+
+# @brief   Run many scenarios (events x seeds) in parallel, one SUMO instance per worker process.
+#
+# A scenario is a dict such as
+#   {"name": "flood_E12", "seed": 1, "steps": 101, "max_speed": {"E12": 3.0}, "closed": ["E4"]}
+# where max_speed sets new speed limits on edges and closed closes edges for all vehicles, both
+# from the first step on. Events at later steps go into "events" (see mobility/events.py).
+# Every scenario runs in its own working directory with its own route file and outputs.
+
+import multiprocessing
+import os
+import random
+import time
+
+import pandas as pd
+import traci
+
+from mobility import fleet
+from mobility.events import EventEngine, scenario_events
+from mobility.parsers import dump_edges_xml_to_df
+from mobility.routing import fixed_route_library
+from mobility.stepping import Stepper
+
+NET_FILE = 'straight.net.xml'
+
+EDGE_DATA = """<additional>
+    <edgeData id="edgeStats" file="dump_edges.xml" excludeEmpty="true"/>
+    <edgeData type="emissions" id="edgeStatsEmissions" file="dump_edges_co2.xml" excludeEmpty="true"/>
+</additional>
+"""
+
+
+def expand_scenarios(scenarios, seeds):
+    """one copy of every scenario per seed, unless the scenario names its own seed"""
+    expanded = []
+    for scenario in scenarios:
+        if 'seed' in scenario:
+            expanded.append(dict(scenario))
+            continue
+        for seed in range(seeds):
+            expanded.append(dict(scenario, seed=seed))
+    return expanded
+
+
+def run_scenario(scenario, sumo_binary, workdir, base_dir, last_state=None):
+    """run one scenario in workdir/<name>_<seed> and return its edge statistics and timing"""
+    label = f"{scenario['name']}_{scenario['seed']}"
+    scenario_dir = os.path.abspath(os.path.join(workdir, label))
+    if not os.path.exists(scenario_dir):
+        os.makedirs(scenario_dir)
+    rng = random.Random(scenario['seed'])
+    routes = scenario.get('routes', fleet.ROUTES)
+    # A scenario may generate its fleet from a demand, see DEMAND in mobility/fleet.py
+    demand = dict(fleet.DEMAND, **scenario['demand']) if 'demand' in scenario else None
+    library = fixed_route_library(routes, os.path.join(base_dir, NET_FILE)) if demand else None
+    vtypes = fleet.demand_vtypes(demand) if demand else None
+    if last_state is None:
+        vehicles = fleet.first_round_vehicles(library=library, rng=rng, demand=demand)
+    else:
+        # last_state is a checkpoint of mobility.checkpoint; every scenario draws its own routes
+        vehicles = fleet.next_round_vehicles(last_state['vehicles'], fleet.fleet_carIDs(last_state['fleet'], demand),
+                                             routes, rng, library, demand,
+                                             dict(zip(last_state['fleet'], last_state.get('vtypes') or [])))
+    route_file = os.path.join(scenario_dir, 'straight.rou.xml')
+    fleet.write_routefile(route_file, routes, vehicles, 'mobility/batch.py', vtypes=vtypes)
+    additional_file = os.path.join(scenario_dir, 'edges.add.xml')
+    with open(additional_file, 'w') as additional:
+        additional.write(EDGE_DATA)
+
+    steps = scenario.get('steps', 101)
+    start = time.perf_counter()
+    traci.start([sumo_binary, "-n", os.path.join(base_dir, NET_FILE), "-r", route_file, "-a", additional_file,
+                 "--begin", "0", "--end", str(steps), "--time-to-teleport", "-1",
+                 "--seed", str(scenario['seed']), "--no-step-log", "--no-warnings",
+                 "--tripinfo-output", os.path.join(scenario_dir, 'tripinfo.xml'),
+                 "--tripinfo-output.write-unfinished", "True"], label=label)
+    stepper = Stepper()
+    stepper.add_listener(EventEngine(scenario_events(scenario)))
+    stepper.run(steps)
+    traci.close()
+    seconds = time.perf_counter() - start
+
+    traffic = dump_edges_xml_to_df(os.path.join(scenario_dir, 'dump_edges.xml'))
+    emissions = dump_edges_xml_to_df(os.path.join(scenario_dir, 'dump_edges_co2.xml'))
+    emission_columns = ['id'] + [column for column in emissions.columns if column not in traffic.columns]
+    edges = traffic.merge(emissions[emission_columns], on='id', how='outer')
+    edges.insert(0, 'seed', scenario['seed'])
+    edges.insert(0, 'scenario', scenario['name'])
+    return edges, {'scenario': scenario['name'], 'seed': scenario['seed'], 'seconds': seconds,
+                   'steps_per_sec': stepper.metrics()['steps_per_sec']}
+
+
+def run_batch(scenarios, sumo_binary, workdir='batch', processes=None, last_state=None, base_dir='.'):
+    """run all scenarios on a pool of processes, return (edge statistics, per-scenario timing, throughput)"""
+    base_dir = os.path.abspath(base_dir)
+    processes = processes or os.cpu_count() or 1
+    start = time.perf_counter()
+    frames, timings = [], []
+    with multiprocessing.Pool(processes) as pool:
+        tasks = [(scenario, sumo_binary, workdir, base_dir, last_state) for scenario in scenarios]
+        for edges, timing in pool.starmap(run_scenario, tasks, chunksize=1):
+            frames.append(edges)
+            timings.append(timing)
+    elapsed = time.perf_counter() - start
+    throughput = {'scenarios': len(scenarios), 'processes': processes, 'seconds': elapsed,
+                  'scenarios_per_hour': len(scenarios) / elapsed * 3600 if elapsed else 0.0}
+    df_edges = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    return df_edges, pd.DataFrame(timings), throughput
@@ -0,0 +1,71 @@
+# @author    Muzaffer Citir
+# @date      2026.10.18
+# @location  Berlin, Germany
+# @version   1.0
+
+# @brief   Compact end-of-round checkpoint, all the next round needs to continue the simulation.
+#
+# The checkpoint holds HasRun, the carIDs of the fleet, the route, edge index, lane, position and
+# speed of every car which continues its route, and the state of the random generator. It is
+# replaced atomically, so a round which is interrupted leaves the previous checkpoint untouched.
+
+import json
+import os
+
+from mobility import fleet
+
+CHECKPOINT_FILE = 'store/checkpoint.json'
+
+VEHICLE_FIELDS = ['carID', 'route', 'edge', 'lane', 'pos', 'speed']
+
+
+def make_checkpoint(has_run, continuing, carIDs, rng_state=None, vtypes=None):
+    # vtypes is the vType of every car of the fleet, for fleets with a mix of vTypes
+    return {'HasRun': has_run, 'fleet': list(carIDs), 'vehicles': continuing, 'rng_state': rng_state,
+            'vtypes': vtypes}
+
+
+def write_checkpoint(checkpoint, checkpoint_file=CHECKPOINT_FILE):
+    # Vehicles are stored column by column, which keeps the file small for large fleets
+    columns = {field: [getattr(vehicle, field) for vehicle in checkpoint['vehicles']] for field in VEHICLE_FIELDS}
+    columns['edge'] = [int(edge) for edge in columns['edge']]
+    columns['pos'] = [round(float(pos), 2) for pos in columns['pos']]
+    columns['speed'] = [round(float(speed), 2) for speed in columns['speed']]
+    content = {'HasRun': int(checkpoint['HasRun']), 'fleet': checkpoint['fleet'], 'vehicles': columns,
+               'rng_state': checkpoint['rng_state'], 'vtypes': checkpoint.get('vtypes')}
+    directory = os.path.dirname(checkpoint_file)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    with open(checkpoint_file + '.tmp', 'w') as output:
+        json.dump(content, output, separators=(',', ':'))
+        output.flush()
+        os.fsync(output.fileno())
+    os.replace(checkpoint_file + '.tmp', checkpoint_file)
+
+
+def read_checkpoint(checkpoint_file=CHECKPOINT_FILE):
+    if not os.path.exists(checkpoint_file):
+        return None
+    with open(checkpoint_file) as checkpoint_input:
+        content = json.load(checkpoint_input)
+    columns = content['vehicles']
+    vehicles = [fleet.Vehicle(*values) for values in zip(*(columns[field] for field in VEHICLE_FIELDS))]
+    rng_state = content['rng_state']
+    if rng_state is not None:
+        # JSON turns the tuples of random.getstate() into lists
+        rng_state = (rng_state[0], tuple(rng_state[1]), rng_state[2])
+    return make_checkpoint(content['HasRun'], vehicles, content['fleet'], rng_state, content.get('vtypes'))
+
+
+def load_previous_round(routes, checkpoint_file=CHECKPOINT_FILE, store_root='store'):
+    """checkpoint of the previous round, rebuilt from the store or csv files if there is no checkpoint yet"""
+    checkpoint = read_checkpoint(checkpoint_file)
+    if checkpoint is not None:
+        return checkpoint
+    # pandas and pyarrow are only loaded when there is no checkpoint
+    from mobility import storage
+    previous_round = storage.load_previous_round(storage.RoundStore(store_root))
+    if previous_round is None:
+        return None
+    has_run, df_stats_last_time, carIDs = previous_round
+    return make_checkpoint(has_run, fleet.continuing_vehicles(df_stats_last_time, routes), carIDs)
@@ -0,0 +1,107 @@
+# @author    Muzaffer Citir
+# @date      2026.10.18
+# @location  Berlin, Germany
+# @version   1.0
+
+# @brief   In-loop vehicle state capture through TraCI subscriptions, replacing the netstate dump.
+
+import numpy as np
+import pandas as pd
+import traci
+import traci.constants as tc
+
+from mobility.parsers import DUMP_COLUMNS
+
+
+class StateCollector(object):
+    """stepping listener which records the state of every vehicle into preallocated arrays
+
+    The Stepper subscribes every departing vehicle to its edge, lane, lane position, speed and route
+    (with the other VEHICLE_VARIABLES of mobility.stepping), so that the values come back with each
+    simulation step instead of one TraCI call per value.
+    A sample is taken every `interval` steps and always at the last step of the round; with
+    final_only only the last step is kept, which is all the next round needs to restore from.
+    """
+
+    # The vehicles are subscribed by the Stepper before the collector records them
+    subscribes_vehicles = True
+
+    def __init__(self, steps, interval=1, final_only=False, expected_vehicles=10):
+        self.steps = steps
+        self.interval = max(1, interval)
+        self.final_only = final_only
+        samples = 1 if final_only else (steps - 1) // self.interval + 2
+        self.allocate(samples * max(1, expected_vehicles))
+        self.rows = 0
+        self.ids = {'carID': {}, 'edgeID': {}, 'laneID': {}, 'route': {}}
+        self.step_length = None
+
+    def allocate(self, capacity):
+        self.time = np.empty(capacity, dtype=np.float64)
+        self.pos = np.empty(capacity, dtype=np.float64)
+        self.speed = np.empty(capacity, dtype=np.float64)
+        self.codes = {name: np.empty(capacity, dtype=np.int32) for name in ('carID', 'edgeID', 'laneID', 'route')}
+
+    def grow(self, needed):
+        capacity = len(self.time)
+        while capacity < needed:
+            capacity *= 2
+        for name in ('time', 'pos', 'speed'):
+            column = np.empty(capacity, dtype=np.float64)
+            column[:self.rows] = getattr(self, name)[:self.rows]
+            setattr(self, name, column)
+        for name, codes in self.codes.items():
+            column = np.empty(capacity, dtype=np.int32)
+            column[:self.rows] = codes[:self.rows]
+            self.codes[name] = column
+
+    def code(self, name, value):
+        index = self.ids[name]
+        code = index.get(value)
+        if code is None:
+            code = index[value] = len(index)
+        return code
+
+    def __call__(self, step):
+        if self.step_length is None:
+            self.step_length = traci.simulation.getDeltaT()
+        last_step = step == self.steps - 1
+        if not last_step and (self.final_only or step % self.interval):
+            return
+        self.record(traci.simulation.getSubscriptionResults()[tc.VAR_TIME] - self.step_length)
+
+    def record(self, time):
+        results = traci.vehicle.getAllSubscriptionResults()
+        if self.final_only:
+            self.rows = 0
+        if self.rows + len(results) > len(self.time):
+            self.grow(self.rows + len(results))
+        row = self.rows
+        # Same time convention as the netstate dump: the time of the step just computed. After
+        # simulationStep, simulation.getTime() is already one step further, hence time - step_length
+        # in __call__. The vehicle values are those of the step just computed, also for a vehicle
+        # subscribed in this step, since subscribe() returns its current values right away
+        self.time[row:row + len(results)] = time
+        car_codes, edge_codes, lane_codes, route_codes = (self.codes[name] for name in
+                                                          ('carID', 'edgeID', 'laneID', 'route'))
+        for car, values in results.items():
+            if not values:
+                # A vehicle subscribed without variables, e.g. by another TraCI client
+                continue
+            car_codes[row] = self.code('carID', car)
+            edge_codes[row] = self.code('edgeID', values[tc.VAR_ROAD_ID])
+            lane_codes[row] = self.code('laneID', values[tc.VAR_LANE_ID])
+            route_codes[row] = self.code('route', values[tc.VAR_ROUTE_ID])
+            self.pos[row] = values[tc.VAR_LANEPOSITION]
+            self.speed[row] = values[tc.VAR_SPEED]
+            row += 1
+        self.rows = row
+
+    def to_dataframe(self):
+        """recorded states with the columns of dump_xml_to_df plus the route of each vehicle"""
+        rows = self.rows
+        columns = {'time': self.time[:rows].copy(), 'pos': self.pos[:rows].copy(),
+                   'speed': self.speed[:rows].copy()}
+        for name, index in self.ids.items():
+            columns[name] = pd.Categorical.from_codes(self.codes[name][:rows].copy(), categories=list(index))
+        return pd.DataFrame(columns, columns=DUMP_COLUMNS + ['route'])
@@ -0,0 +1,128 @@
+# @author    Muzaffer Citir
+# @date      2026.10.18
+# @location  Berlin, Germany
+# @version   1.0
+
+# @brief   Timeline of road events (speed limits, closures) applied through TraCI while a round runs.
+#
+# An event is a dict such as
+#   {"edges": ["E12", "-E12"], "start": 20, "end": 60, "max_speed": 3.0}
+#   {"edges": ["E4", "-E4"], "start": 10, "closed": true}
+# It is applied right after simulation step `start` of the round and reverted after step `end`
+# (never, without `end`). Events on the same edge should not overlap in time, since reverting an
+# event restores the edge as it was when the event started.
+
+import json
+
+import traci
+import traci.constants as tc
+
+
+def load_events(events_file):
+    with open(events_file) as events_input:
+        return json.load(events_input)
+
+
+def scenario_events(scenario):
+    """events of a batch scenario: its max_speed and closed edges from the first step on, then its own events"""
+    events = [{'edges': [edge], 'start': 0, 'max_speed': speed}
+              for edge, speed in scenario.get('max_speed', {}).items()]
+    if scenario.get('closed'):
+        events.append({'edges': list(scenario['closed']), 'start': 0, 'closed': True})
+    return events + list(scenario.get('events', []))
+
+
+class EventEngine(object):
+    """stepping listener which applies the events due at a step and reroutes the affected vehicles once
+
+    The events are indexed by step, so a step without events costs one dict lookup. The Stepper
+    subscribes every vehicle when it departs, so the routes of all vehicles come with the simulation
+    step and only the vehicles with a changed edge ahead are rerouted. Step 0 starts the timeline
+    over, so a RoundServer replays the events in every round.
+    """
+
+    # The Stepper subscribes the vehicles, so their routes come with every step
+    subscribes_vehicles = True
+
+    def __init__(self, events):
+        self.events = list(events)
+        self.saved = {}
+        self.lane_ids = {}
+        self.route_edges = {}
+        self.reset()
+
+    def reset(self):
+        # Events still applied at the end of the previous round are reverted first, so that they
+        # are applied to the roads as they were before
+        for number in list(self.saved):
+            self.revert(number)
+        self.timeline = {}
+        for number, event in enumerate(self.events):
+            self.timeline.setdefault(int(event.get('start', 0)), []).append(('apply', number, event))
+            if event.get('end') is not None:
+                self.timeline.setdefault(int(event['end']), []).append(('revert', number, event))
+
+    def lanes(self, edge):
+        if edge not in self.lane_ids:
+            self.lane_ids[edge] = [f'{edge}_{lane}' for lane in range(traci.edge.getLaneNumber(edge))]
+        return self.lane_ids[edge]
+
+    def __call__(self, step):
+        if step == 0:
+            self.reset()
+        due = self.timeline.pop(step, None)
+        if not due:
+            return
+        changed = set()
+        reopened = False
+        for action, number, event in due:
+            if action == 'apply':
+                self.apply(number, event)
+            else:
+                reopened = self.revert(number) or reopened
+            changed.update(event['edges'])
+        self.reroute(changed, everyone=reopened)
+
+    def apply(self, number, event):
+        saved = []
+        for edge in event['edges']:
+            lanes = self.lanes(edge)
+            if 'max_speed' in event:
+                saved += [('speed', lane, traci.lane.getMaxSpeed(lane)) for lane in lanes]
+                traci.edge.setMaxSpeed(edge, event['max_speed'])
+            if event.get('closed'):
+                saved += [('disallowed', lane, traci.lane.getDisallowed(lane)) for lane in lanes]
+                for lane in lanes:
+                    traci.lane.setDisallowed(lane, ['all'])
+        self.saved[number] = saved
+
+    def revert(self, number):
+        """restore the lanes of an event, return True if a closed edge was opened again"""
+        reopened = False
+        for kind, lane, value in reversed(self.saved.pop(number, [])):
+            if kind == 'speed':
+                traci.lane.setMaxSpeed(lane, value)
+            else:
+                traci.lane.setDisallowed(lane, list(value))
+                reopened = True
+        return reopened
+
+    def edges_of(self, route):
+        # Edges of a route, asked once per route; a rerouted vehicle gets a route of its own
+        if route not in self.route_edges:
+            self.route_edges[route] = traci.route.getEdges(route)
+        return self.route_edges[route]
+
+    def reroute(self, changed, everyone=False):
+        # Only vehicles with a changed edge ahead of them are rerouted, all of them when a road is
+        # opened again, since any vehicle may now have a faster route. The vehicles are picked from
+        # the subscription results; TraCI has no call which reroutes several vehicles at once
+        results = traci.vehicle.getAllSubscriptionResults()
+        for vehicle, values in results.items():
+            if not everyone:
+                if tc.VAR_ROUTE_ID not in values:
+                    continue
+                route = self.edges_of(values[tc.VAR_ROUTE_ID])
+                if changed.isdisjoint(route[max(values[tc.VAR_ROUTE_INDEX], 0):]):
+                    continue
+            traci.vehicle.rerouteTraveltime(vehicle)
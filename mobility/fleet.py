@@ -0,0 +1,263 @@
+# @author    Muzaffer Citir
+# @date      2026.10.18
+# @location  Berlin, Germany
+# @version   1.0
+
+# @brief   Put the planned vehicles of a round into the simulation, as a route file or through TraCI.
+
+from collections import namedtuple
+import json
+import random
+
+import numpy as np
+import traci
+
+# edge is the index of the edge in the route the vehicle continues from, lane the ID of its lane;
+# edge, lane and speed are None for a vehicle which starts on the first edge of its route, at pos
+# (None: 0). vtype is the ID of its vType (None: the first vType), depart its departure time (None: 0)
+Vehicle = namedtuple('Vehicle', ['carID', 'route', 'edge', 'lane', 'pos', 'speed', 'vtype', 'depart'],
+                     defaults=(None, None))
+
+ROUTES = {'route0': ['E0', 'E12', 'E4', 'E7'],
+          'route1': ['-E7', '-E4', '-E12', '-E0'],
+          'route2': ['-E6', '-E12', 'E2']}
+
+VTYPE = {'id': 'passenger1', 'accel': 0.8, 'decel': 4.5, 'sigma': 0.5, 'length': 5, 'minGap': 2.5,
+         'maxSpeed': 33.33, 'guiShape': 'passenger'}
+
+# vType attribute -> traci.vehicletype setter, for vTypes added through TraCI
+VTYPE_SETTERS = {'accel': 'setAccel', 'decel': 'setDecel', 'sigma': 'setImperfection', 'length': 'setLength',
+                 'minGap': 'setMinGap', 'maxSpeed': 'setMaxSpeed', 'guiShape': 'setShapeClass',
+                 'vClass': 'setVehicleClass', 'speedFactor': 'setSpeedFactor', 'tau': 'setTau',
+                 'width': 'setWidth', 'emissionClass': 'setEmissionClass'}
+
+# Demand of a generated fleet: number of vehicles, vType mix (a weight per vType), departure times
+# spread uniformly or as Poisson arrivals over [begin, end], and departure positions at the start
+# of the first edge of the route ('base') or anywhere on it ('random')
+DEMAND = {'size': 10,
+          'vtypes': [dict(VTYPE, weight=1.0)],
+          'depart': {'begin': 0, 'end': 0, 'distribution': 'uniform'},
+          'depart_pos': 'base'}
+
+
+def new_vehicle(car, route):
+    return Vehicle(car, route, None, None, None, None)
+
+
+def assigned_routes(vehicles):
+    return {vehicle.carID: vehicle.route for vehicle in vehicles}
+
+
+def vehicle_states(df_stats_last_time):
+    # carID -> (onRouteAtStart, edgeID, laneID, pos, speed) of every car still driving at the last time step,
+    # built in one pass over the columns so that each lookup afterwards is a dict access
+    return dict(zip(df_stats_last_time['carID'],
+                    zip(df_stats_last_time['onRouteAtStart'], df_stats_last_time['edgeID'],
+                        df_stats_last_time['laneID'], df_stats_last_time['pos'], df_stats_last_time['speed'])))
+
+
+def route_edge_indices(routes):
+    # routeID -> {edgeID: position of the edge in the route}, replaces list.index() per car
+    return {route: {edge: index for index, edge in enumerate(edges)} for route, edges in routes.items()}
+
+
+def load_demand(demand_file=None, size=None):
+    """DEMAND, updated from a JSON file and with another fleet size if given"""
+    demand = dict(DEMAND)
+    if demand_file:
+        with open(demand_file) as demand_input:
+            demand.update(json.load(demand_input))
+    if size is not None:
+        demand['size'] = size
+    return demand
+
+
+def demand_vtypes(demand):
+    # vType attributes without the sampling weight
+    return [{key: value for key, value in vtype.items() if key != 'weight'} for vtype in demand['vtypes']]
+
+
+def sample_vehicles(carIDs, library, demand, vtypes=None, rng=random):
+    """new vehicles for carIDs with route, vType, departure time and position drawn for all of them at once
+
+    vtypes maps the carIDs which already have a vType to it. The numpy generator is seeded from rng,
+    so restoring the state of rng replays the draw.
+    """
+    count = len(carIDs)
+    picks = library.sample_indices(count, rng)
+    generator = np.random.default_rng(rng.getrandbits(64))
+
+    weights = np.array([vtype.get('weight', 1.0) for vtype in demand['vtypes']], dtype=float)
+    type_ids = np.array([vtype['id'] for vtype in demand['vtypes']])
+    drawn_types = type_ids[generator.choice(len(weights), size=count, p=weights / weights.sum())].tolist()
+    if vtypes:
+        drawn_types = [vtypes.get(car, drawn) for car, drawn in zip(carIDs, drawn_types)]
+
+    depart = dict(DEMAND['depart'], **demand.get('depart', {}))
+    begin, end = float(depart['begin']), float(depart['end'])
+    if end <= begin or not count:
+        departs = np.full(count, begin)
+    elif depart['distribution'] == 'poisson':
+        # Exponential gaps between the vehicles, scaled so that the arrivals fill [begin, end]
+        arrivals = np.cumsum(generator.exponential(1.0, count + 1))
+        departs = begin + (end - begin) * arrivals[:-1] / arrivals[-1]
+    else:
+        departs = generator.uniform(begin, end, count)
+
+    if demand.get('depart_pos', 'base') == 'random':
+        positions = generator.random(count) * library.first_lengths[picks]
+    else:
+        positions = np.zeros(count)
+
+    route_ids = library.route_ids
+    return [Vehicle(car, route_ids[pick], None, None, pos, None, vtype, depart_)
+            for car, pick, pos, vtype, depart_ in zip(carIDs, picks.tolist(), np.round(positions, 2).tolist(),
+                                                     drawn_types, np.round(departs, 2).tolist())]
+
+
+def first_round_vehicles(size=10, route='route0', library=None, rng=random, demand=None):
+    # Every car starts at the beginning of the same route in the first round, or of a route
+    # drawn from the route library; with a demand the whole fleet is generated from it
+    if demand is not None:
+        return sample_vehicles([f'car{i}' for i in range(demand['size'])], library, demand, rng=rng)
+    if library is not None:
+        return [new_vehicle(f'car{i}', sampled) for i, sampled in enumerate(library.sample(size, rng))]
+    return [new_vehicle(f'car{i}', route) for i in range(size)]
+
+
+def continuing_vehicles(df_stats_last_time, routes):
+    """vehicle records of the cars which can continue their route from the last time step"""
+    edge_indices = route_edge_indices(routes)
+    vehicles = []
+    for car, (route_is_, edgeID, lane_is_, pos_is_, speed_is_) in vehicle_states(df_stats_last_time).items():
+        # A car on a junction at the end of the round is not on an edge of its route
+        # and cannot be placed again, so it starts over like a car which completed its route
+        edge_is_ = edge_indices.get(route_is_, {}).get(edgeID)
+        if edge_is_ is not None:
+            vehicles.append(Vehicle(car, route_is_, edge_is_, lane_is_, pos_is_, speed_is_))
+    return vehicles
+
+
+def fleet_carIDs(carIDs, demand=None):
+    """carIDs of the fleet of the next round: the size of the demand, if given, by new cars or by dropping the last ones"""
+    if demand is None:
+        return list(carIDs)
+    if demand['size'] > len(carIDs):
+        # The fleet has grown since the previous round. The carIDs come in dump order and need not be
+        # car0..carN-1, so the new cars are numbered on from the highest car number in the fleet
+        numbers = [int(carID[3:]) for carID in carIDs if carID.startswith('car') and carID[3:].isdigit()]
+        first = max(numbers) + 1 if numbers else 0
+        return list(carIDs) + [f'car{i}' for i in range(first, first + demand['size'] - len(carIDs))]
+    # The fleet has shrunk, the cars beyond its size leave it, also when still driving
+    return list(carIDs)[:demand['size']]
+
+
+def next_round_vehicles(continuing, carIDs, routes, rng=random, library=None, demand=None, vtypes=None):
+    """plan the next round: continuing cars keep their route and position, the others get a new route
+
+    With a route library the new routes are drawn from it for all cars at once, with a demand also
+    their departure time and position. vtypes maps carIDs to the vType each car keeps.
+    """
+    # A car whose route is not known any more, e.g. after switching to the route library, starts over
+    continuing = {vehicle.carID: vehicle for vehicle in continuing if vehicle.route in routes}
+    # A car keeps its vType only if the route file of this round defines it, else it gets the default
+    # vType, e.g. a truck of a previous round with --demand in a round without it
+    known_vtypes = {vtype['id'] for vtype in demand['vtypes']} if demand is not None else set()
+    vtypes = {car: vtype for car, vtype in (vtypes or {}).items() if vtype in known_vtypes}
+    if vtypes:
+        continuing = {car: vehicle._replace(vtype=vtypes.get(car)) for car, vehicle in continuing.items()}
+    if demand is not None:
+        new_cars = [car for car in carIDs if car not in continuing]
+        new_vehicles = dict(zip(new_cars, sample_vehicles(new_cars, library, demand, vtypes, rng)))
+        return [continuing.get(car) or new_vehicles[car] for car in carIDs]
+    if library is None:
+        route_ids = list(routes.keys())
+        return [continuing.get(car) or new_vehicle(car, rng.choice(route_ids)) for car in carIDs]
+    new_cars = [car for car in carIDs if car not in continuing]
+    new_routes = dict(zip(new_cars, library.sample(len(new_cars), rng)))
+    return [continuing.get(car) or new_vehicle(car, new_routes[car]) for car in carIDs]
+
+
+def write_routefile(route_file, routes, vehicles, generator, vtype=VTYPE, vtypes=None):
+    """write vehicles to a SUMO route file in one go; vtypes replaces vtype by a list of vTypes"""
+    vtypes = vtypes or [vtype]
+    default_type = vtypes[0]['id']
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+             f'<!-- generated via {generator} in run.py -->',
+             '<routes>']
+    for type_ in vtypes:
+        vtype_attributes = ' '.join(f'{key}="{value}"' for key, value in type_.items())
+        lines.append(f'    <vType {vtype_attributes}/>')
+    for route, edges in routes.items():
+        lines.append(f'    <route id="{route}" edges="{" ".join(edges)}"/>')
+    if any(vehicle.depart for vehicle in vehicles):
+        # SUMO reads the vehicles of a route file in the order of their departure
+        vehicles = sorted(vehicles, key=lambda vehicle: vehicle.depart or 0)
+    for vehicle in vehicles:
+        type_id = vehicle.vtype or default_type
+        depart = f'{vehicle.depart:.2f}' if vehicle.depart else '0'
+        if vehicle.edge is None:
+            lines.append(f'    <vehicle id="{vehicle.carID}" type="{type_id}" route="{vehicle.route}" '
+                         f'departPos="{vehicle.pos or 0:.2f}" depart="{depart}"/>')
+        else:
+            lines.append(f'    <vehicle id="{vehicle.carID}" type="{type_id}" route="{vehicle.route}" '
+                         f'depart="0" departLane="{vehicle.lane.split("_")[-1]}" departEdge="{vehicle.edge}" '
+                         f'departPos="{vehicle.pos:.2f}" departSpeed="{vehicle.speed:.2f}"/>')
+    lines.append('</routes>')
+    with open(route_file, 'w') as output:
+        output.write('\n'.join(lines) + '\n')
+
+
+def register_vtype(vtype):
+    # Copy of the default vType with the attributes of vtype, unless SUMO knows it already
+    if vtype['id'] in traci.vehicletype.getIDList():
+        return
+    traci.vehicletype.copy('DEFAULT_VEHTYPE', vtype['id'])
+    for key, value in vtype.items():
+        if key in VTYPE_SETTERS:
+            getattr(traci.vehicletype, VTYPE_SETTERS[key])(vtype['id'], value)
+
+
+def inject_vehicles(routes, vehicles, vtype=VTYPE, vtypes=None):
+    """register the vTypes and routes and add vehicles through TraCI, before the first simulation step
+
+    A vehicle which continues its route is added on its route, moved to its previous lane and
+    position and held at its previous speed. The returned SpeedRelease has to be called after
+    the first simulation step to hand the speed back to the car-following model.
+    """
+    vtypes = vtypes or [vtype]
+    default_type = vtypes[0]['id']
+    for type_ in vtypes:
+        register_vtype(type_)
+    known_routes = set(traci.route.getIDList())
+    for route, edges in routes.items():
+        if route not in known_routes:
+            traci.route.add(route, edges)
+    restored = []
+    for vehicle in vehicles:
+        type_id = vehicle.vtype or default_type
+        if vehicle.edge is None:
+            traci.vehicle.add(vehicle.carID, vehicle.route, typeID=type_id, depart=str(vehicle.depart or 0),
+                              departPos=str(vehicle.pos or 0))
+        else:
+            traci.vehicle.add(vehicle.carID, vehicle.route, typeID=type_id, depart='0')
+            traci.vehicle.moveTo(vehicle.carID, vehicle.lane, vehicle.pos)
+            traci.vehicle.setSpeed(vehicle.carID, vehicle.speed)
+            restored.append(vehicle.carID)
+    return SpeedRelease(restored)
+
+
+class SpeedRelease(object):
+    """stepping listener which releases the speed of restored vehicles after the first step"""
+
+    def __init__(self, cars):
+        self.cars = cars
+
+    def __call__(self, step):
+        if not self.cars:
+            return
+        driving = set(traci.vehicle.getIDList())
+        for car in self.cars:
+            if car in driving:
+                traci.vehicle.setSpeed(car, -1)
+        self.cars = []
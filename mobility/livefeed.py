@@ -0,0 +1,307 @@
+# @author    Muzaffer Citir
+# @date      2026.10.18
+# @location  Berlin, Germany
+# @version   1.0
+
+# @brief   Live state of a running round for the game client, in a memory-mapped ring buffer.
+#
+# The feed file has a fixed binary layout (little endian), so a client maps it once and reads the
+# latest frame without any parsing:
+#   header     64 bytes  FEED_HEADER
+#   edge table           FEED_EDGE per edge, in the order of the edge states of every frame
+#   slots      `slots` frames of slot_size bytes, frame seq in slot seq % slots
+# A frame is FRAME_HEADER, then EDGE_STATE for every edge, then vehicle_state() for up to
+# max_vehicles vehicles. The writer clears the seq of a slot before it writes the frame and sets it
+# afterwards, then sets `latest` in the header; a reader which finds another seq in the slot after
+# copying it has been overtaken and reads again.
+# A new round writes into the same file and increases `generation`, so the clients keep their map
+# (on Windows a mapped file cannot be replaced) and seq keeps counting. Only a round with another
+# layout, e.g. another number of edges or vehicles, replaces the file; a client which sees
+# FeedReader.replaced() then opens it again.
+
+import mmap
+import os
+
+import numpy as np
+import traci
+import traci.constants as tc
+
+FEED_FILE = os.path.join('dump', 'live.feed')
+FEED_MAGIC = b'CCLF'
+FEED_VERSION = 2
+
+# state of the feed: written while the round runs, ended after its last step
+RUNNING, ENDED = 1, 2
+
+FEED_HEADER = np.dtype([('magic', 'S4'), ('version', '<u4'), ('state', '<u4'), ('slots', '<u4'),
+                        ('edges', '<u4'), ('max_vehicles', '<u4'), ('edge_id_width', '<u4'),
+                        ('vehicle_id_width', '<u4'), ('has_run', '<u4'), ('generation', '<u4'),
+                        ('slot_size', '<u8'), ('latest', '<u8')])
+# Fields of the header which fix the layout of the file
+LAYOUT_FIELDS = ['magic', 'version', 'slots', 'edges', 'max_vehicles', 'edge_id_width', 'vehicle_id_width',
+                 'slot_size']
+FRAME_HEADER = np.dtype([('seq', '<u8'), ('time', '<f8'), ('step', '<u4'), ('vehicles', '<u4'),
+                         ('total_vehicles', '<u4'), ('generation', '<u4')])
+# density in vehicles/km, speed the mean speed of the vehicles on the edge in m/s, co2 in mg/s
+EDGE_STATE = np.dtype([('vehicles', '<u4'), ('density', '<f4'), ('speed', '<f4'), ('co2', '<f4')])
+
+HEADER_SIZE = 64
+ALIGNMENT = 64
+
+def aligned(size):
+    return (size + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def feed_edge(edge_id_width):
+    return np.dtype([('id', f'S{edge_id_width}'), ('length', '<f4')])
+
+
+def vehicle_state(vehicle_id_width):
+    # id is the carID; edge the position of the edge in the edge table, -1 on a junction; x and y in
+    # net coordinates
+    return np.dtype([('id', f'S{vehicle_id_width}'), ('edge', '<i4'), ('x', '<f4'), ('y', '<f4'),
+                     ('speed', '<f4'), ('angle', '<f4')])
+
+
+def layout(edges, max_vehicles, edge_id_width, vehicle_id_width):
+    """(offset of the first slot, size of a slot) of a feed file"""
+    data_offset = HEADER_SIZE + aligned(edges * feed_edge(edge_id_width).itemsize)
+    slot_size = aligned(FRAME_HEADER.itemsize + edges * EDGE_STATE.itemsize +
+                        max_vehicles * vehicle_state(vehicle_id_width).itemsize)
+    return data_offset, slot_size
+
+
+def net_edges(net_file):
+    """(edge IDs, lengths in m) of the edges of a net, without the internal ones"""
+    import sumolib
+    edges = sumolib.net.readNet(net_file).getEdges(withInternal=False)
+    return [edge.getID() for edge in edges], [edge.getLength() for edge in edges]
+
+
+class FeedFile(object):
+    """numpy views of the header, edge table and slots of a mapped feed file"""
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.header = np.ndarray((), FEED_HEADER, buffer)
+        if bytes(self.header['magic']) != FEED_MAGIC or self.header['version'] != FEED_VERSION:
+            raise ValueError("not a live feed file of this version")
+        edges, max_vehicles = int(self.header['edges']), int(self.header['max_vehicles'])
+        edge_id_width, vehicle_id_width = int(self.header['edge_id_width']), int(self.header['vehicle_id_width'])
+        self.edge_table = np.ndarray(edges, feed_edge(edge_id_width), buffer, HEADER_SIZE)
+        data_offset, slot_size = layout(edges, max_vehicles, edge_id_width, vehicle_id_width)
+        vehicle = vehicle_state(vehicle_id_width)
+        self.frames, self.edge_states, self.vehicle_states = [], [], []
+        for slot in range(int(self.header['slots'])):
+            offset = data_offset + slot * slot_size
+            self.frames.append(np.ndarray((), FRAME_HEADER, buffer, offset))
+            offset += FRAME_HEADER.itemsize
+            self.edge_states.append(np.ndarray(edges, EDGE_STATE, buffer, offset))
+            offset += edges * EDGE_STATE.itemsize
+            self.vehicle_states.append(np.ndarray(max_vehicles, vehicle, buffer, offset))
+
+
+class FeedWriter(object):
+    """write frames of edge and vehicle states into the ring buffer of a feed file
+
+    vehicle_id_width is the length in bytes of the longest carID, e.g. from the carIDs of the fleet.
+    """
+
+    def __init__(self, feed_file, edge_ids, edge_lengths, max_vehicles, slots=8, has_run=0, vehicle_id_width=16):
+        self.feed_file = feed_file
+        edge_id_width = max([len(edge.encode()) for edge in edge_ids] + [1])
+        data_offset, slot_size = layout(len(edge_ids), max_vehicles, edge_id_width, vehicle_id_width)
+        header = np.zeros((), FEED_HEADER)
+        header['magic'], header['version'], header['slots'] = FEED_MAGIC, FEED_VERSION, slots
+        header['edges'], header['max_vehicles'], header['slot_size'] = len(edge_ids), max_vehicles, slot_size
+        header['edge_id_width'], header['vehicle_id_width'] = edge_id_width, vehicle_id_width
+        edge_table = np.zeros(len(edge_ids), feed_edge(edge_id_width))
+        edge_table['id'] = [edge.encode() for edge in edge_ids]
+        edge_table['length'] = edge_lengths
+        if not self.reusable(header, edge_table, data_offset + slots * slot_size):
+            self.create(header, edge_table, data_offset + slots * slot_size)
+        with open(feed_file, 'r+b') as output:
+            self.mmap = mmap.mmap(output.fileno(), 0)
+        self.feed = FeedFile(self.mmap)
+        # The frames of the previous round stay readable until they are overwritten, seq goes on
+        self.seq = int(self.feed.header['latest'])
+        self.generation = int(self.feed.header['generation']) + 1
+        self.feed.header['has_run'], self.feed.header['generation'] = has_run, self.generation
+        self.feed.header['state'] = RUNNING
+        self.vehicle_id_width = vehicle_id_width
+        self.edge_index = {edge: index for index, edge in enumerate(edge_ids)}
+        # Vehicles per km, from the lengths of the edges; an edge without length gets no density
+        lengths = np.asarray(edge_lengths, dtype=np.float64) / 1000.0
+        self.per_km = np.divide(1.0, lengths, out=np.zeros_like(lengths), where=lengths > 0)
+
+    def reusable(self, header, edge_table, size):
+        # A feed file of an earlier round with the same layout and edges is written in place
+        if not os.path.exists(self.feed_file) or os.path.getsize(self.feed_file) != size:
+            return False
+        with open(self.feed_file, 'rb') as feed_input:
+            data = feed_input.read(HEADER_SIZE + edge_table.nbytes)
+        existing = np.frombuffer(data, FEED_HEADER, 1)[0]
+        return (all(existing[field] == header[field] for field in LAYOUT_FIELDS) and
+                data[HEADER_SIZE:] == edge_table.tobytes())
+
+    def create(self, header, edge_table, size):
+        directory = os.path.dirname(self.feed_file)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        # The file is complete before it replaces the one of the previous round, so a client never
+        # maps a file without its header and edge table
+        with open(self.feed_file + '.tmp', 'wb') as output:
+            output.truncate(size)
+            output.write(header.tobytes())
+            output.seek(HEADER_SIZE)
+            output.write(edge_table.tobytes())
+        try:
+            os.replace(self.feed_file + '.tmp', self.feed_file)
+        except PermissionError:
+            os.remove(self.feed_file + '.tmp')
+            raise PermissionError(f"{self.feed_file} has another layout and is still mapped by a client, "
+                                  "close the client or publish to another file")
+
+    def write(self, step, time, edge_codes, x, y, speed, angle, co2, ids):
+        """write one frame: the vehicles as arrays, edge_codes their position in the edge table (-1: none)
+
+        ids are the carIDs as a bytes array; a carID longer than vehicle_id_width raises a ValueError.
+        """
+        if ids.dtype.itemsize > self.vehicle_id_width:
+            raise ValueError(f"carID longer than the {self.vehicle_id_width} bytes of the feed: "
+                             f"{max(ids.tolist(), key=len).decode()}")
+        self.seq += 1
+        slot = self.seq % len(self.feed.frames)
+        frame = self.feed.frames[slot]
+        frame['seq'] = 0
+        edges = len(self.per_km)
+        on_edge = edge_codes >= 0
+        codes = edge_codes[on_edge]
+        counts = np.bincount(codes, minlength=edges)
+        speed_sums = np.bincount(codes, weights=speed[on_edge], minlength=edges)
+        edge_states = self.feed.edge_states[slot]
+        edge_states['vehicles'] = counts
+        edge_states['density'] = counts * self.per_km
+        edge_states['speed'] = np.divide(speed_sums, counts, out=np.zeros(edges), where=counts > 0)
+        edge_states['co2'] = np.bincount(codes, weights=co2[on_edge], minlength=edges)
+        # Vehicles beyond max_vehicles are counted in total_vehicles but not written
+        count = min(len(edge_codes), len(self.feed.vehicle_states[slot]))
+        vehicle_states = self.feed.vehicle_states[slot][:count]
+        vehicle_states['id'] = ids[:count]
+        vehicle_states['edge'] = edge_codes[:count]
+        vehicle_states['x'], vehicle_states['y'] = x[:count], y[:count]
+        vehicle_states['speed'], vehicle_states['angle'] = speed[:count], angle[:count]
+        frame['time'], frame['step'] = time, step
+        frame['vehicles'], frame['total_vehicles'] = count, len(edge_codes)
+        frame['generation'] = self.generation
+        frame['seq'] = self.seq
+        self.feed.header['latest'] = self.seq
+
+    def close(self):
+        self.feed.header['state'] = ENDED
+        self.mmap.flush()
+        # The views have to go before the map can be closed
+        self.feed = None
+        self.mmap.close()
+
+
+class LiveFeed(object):
+    """stepping listener which publishes the edge and vehicle states every `interval` steps
+
+    The Stepper subscribes every vehicle to its edge, position, angle, speed and CO2 when it departs,
+    so one call per step returns the values of all vehicles.
+    The feed ends after step steps - 1; with steps None, e.g. for a RoundServer, it stays open.
+    """
+
+    # Frames are published from the vehicle subscriptions the Stepper makes
+    subscribes_vehicles = True
+
+    def __init__(self, writer, steps=None, interval=1):
+        self.writer = writer
+        self.steps = steps
+        self.interval = max(1, interval)
+        self.step_length = None
+
+    def __call__(self, step):
+        if self.step_length is None:
+            self.step_length = traci.simulation.getDeltaT()
+        last_step = self.steps is not None and step == self.steps - 1
+        if step % self.interval == 0 or last_step:
+            # The time of the step just computed, as in the netstate dump and the StateCollector;
+            # after simulationStep the simulation time is already one step further
+            time = traci.simulation.getSubscriptionResults()[tc.VAR_TIME] - self.step_length
+            self.publish(step, time, traci.vehicle.getAllSubscriptionResults())
+        if last_step:
+            self.writer.close()
+
+    def publish(self, step, time, results):
+        """write a frame from the subscription results of the vehicles"""
+        # Only vehicles subscribed with the variables of the feed, not by another TraCI client
+        results = {car: values for car, values in results.items() if tc.VAR_POSITION in values}
+        edge_index = self.writer.edge_index
+        values = list(results.values())
+        positions = np.array([value[tc.VAR_POSITION] for value in values], dtype=np.float64).reshape(-1, 2)
+        self.writer.write(step, time,
+                          np.array([edge_index.get(value[tc.VAR_ROAD_ID], -1) for value in values], dtype=np.int32),
+                          positions[:, 0], positions[:, 1],
+                          np.array([value[tc.VAR_SPEED] for value in values], dtype=np.float64),
+                          np.array([value[tc.VAR_ANGLE] for value in values], dtype=np.float64),
+                          np.array([value[tc.VAR_CO2EMISSION] for value in values], dtype=np.float64),
+                          np.array([car.encode() for car in results], dtype=bytes))
+
+
+class FeedReader(object):
+    """read frames of a feed file, for the game client or for tests"""
+
+    def __init__(self, feed_file=FEED_FILE):
+        self.feed_file = feed_file
+        with open(feed_file, 'rb') as feed_input:
+            self.inode = os.fstat(feed_input.fileno()).st_ino
+            self.mmap = mmap.mmap(feed_input.fileno(), 0, access=mmap.ACCESS_READ)
+        self.feed = FeedFile(self.mmap)
+        self.edge_ids = [edge.decode() for edge in self.feed.edge_table['id']]
+
+    def generation(self):
+        # Increased by every round which writes into the file
+        return int(self.feed.header['generation'])
+
+    def replaced(self):
+        """True when a round with another layout has replaced the file, which is then opened again"""
+        try:
+            return os.stat(self.feed_file).st_ino != self.inode
+        except OSError:
+            return False
+
+    def ended(self):
+        return int(self.feed.header['state']) == ENDED
+
+    def latest_seq(self):
+        return int(self.feed.header['latest'])
+
+    def read(self, seq=None, retries=3):
+        """(frame header, edge states, vehicle states) of frame seq, by default the latest one
+
+        The arrays are copies. None when there is no frame yet or frame seq has been overwritten.
+        """
+        for _ in range(retries):
+            wanted = self.latest_seq() if seq is None else seq
+            if not wanted or wanted > self.latest_seq():
+                return None
+            slot = wanted % len(self.feed.frames)
+            frame = self.feed.frames[slot]
+            if int(frame['seq']) != wanted:
+                if seq is not None:
+                    return None
+                continue
+            header = frame.copy()
+            edge_states = self.feed.edge_states[slot].copy()
+            vehicle_states = self.feed.vehicle_states[slot][:int(header['vehicles'])].copy()
+            if int(frame['seq']) == wanted:
+                return header, edge_states, vehicle_states
+            if seq is not None:
+                return None
+        return None
+
+    def close(self):
+        self.feed = None
+        self.mmap.close()
@@ -0,0 +1,219 @@
+# @author    Muzaffer Citir
+# @date      2026.10.18
+# @location  Berlin, Germany
+# @version   1.0
+
+# @brief   Streaming readers which turn the SUMO output files into DataFrames.
+
+from array import array
+from xml.parsers import expat
+
+import numpy as np
+import pandas as pd
+
+DUMP_COLUMNS = ['time', 'carID', 'edgeID', 'laneID', 'pos', 'speed']
+
+# (column, xml attribute, kind) of every <tripinfo> attribute kept in the tripinfo table
+TRIPINFO_SCHEMA = [('carID', 'id', 'category'),
+                   ('depart', 'depart', 'float'),
+                   ('departLane', 'departLane', 'category'),
+                   ('departPos', 'departPos', 'float'),
+                   ('departSpeed', 'departSpeed', 'float'),
+                   ('departDelay', 'departDelay', 'float'),
+                   ('arrival', 'arrival', 'float'),
+                   ('arrivalLane', 'arrivalLane', 'category'),
+                   ('arrivalPos', 'arrivalPos', 'float'),
+                   ('arrivalSpeed', 'arrivalSpeed', 'float'),
+                   ('duration', 'duration', 'float'),
+                   ('routeLength', 'routeLength', 'float'),
+                   ('waitingTime', 'waitingTime', 'float'),
+                   ('rerouteNo', 'rerouteNo', 'int'),
+                   ('speedFactor', 'speedFactor', 'float'),
+                   ('vaporized', 'vaporized', 'category')]
+
+# Columns of simulationStats: the vehicle states with the trip information of each vehicle
+STATS_COLUMNS = ['time', 'carID', 'depart', 'edgeID',
+                 'departLane', 'laneID', 'arrivalLane',
+                 'departPos', 'pos', 'arrivalPos',
+                 'departSpeed', 'speed', 'arrivalSpeed',
+                 'departDelay', 'waitingTime', 'duration', 'arrival',
+                 'routeLength', 'rerouteNo', 'speedFactor', 'vaporized']
+
+# Vehicle states joined with their trips at once when simulationStats is built on demand
+STATS_CHUNK_ROWS = 100000
+
+# <edge> attributes of edgeData outputs depend on the edgeData type, so only the ID is fixed
+# and every other attribute is read as a float column the first time it shows up
+EDGEDATA_SCHEMA = [('id', 'id', 'category')]
+# Counting attributes of the traffic edgeData, read as integers instead of floats
+EDGEDATA_COUNTS = {'departed', 'arrived', 'entered', 'left', 'laneChangedFrom', 'laneChangedTo',
+                   'teleported', 'vaporized'}
+
+
+class CategoryBuffer(object):
+    """collect string IDs as integer codes and build a categorical column at the end"""
+
+    def __init__(self):
+        self.codes = array('i')
+        self.index = {}
+
+    def append(self, value):
+        code = self.index.get(value)
+        if code is None:
+            code = len(self.index)
+            self.index[value] = code
+        self.codes.append(code)
+
+    def append_missing(self, count=1):
+        # Code -1 becomes NaN in the categorical column
+        self.codes.extend([-1] * count)
+
+    def to_categorical(self):
+        codes = np.frombuffer(self.codes, dtype=np.int32) if len(self.codes) else np.empty(0, dtype=np.int32)
+        return pd.Categorical.from_codes(codes, categories=list(self.index))
+
+
+class FloatBuffer(object):
+    """collect numeric attribute values in an array('d'), missing values as NaN"""
+
+    def __init__(self, as_int=False):
+        self.values = array('d')
+        self.as_int = as_int
+
+    def append(self, value):
+        self.values.append(float(value))
+
+    def append_missing(self, count=1):
+        self.values.extend([np.nan] * count)
+
+    def to_column(self):
+        column = float_column(self.values)
+        # Integer attributes stay integers unless a value is missing
+        if self.as_int and not np.isnan(column).any():
+            return column.astype(np.int64)
+        return column
+
+
+def make_buffer(kind):
+    if kind == 'category':
+        return CategoryBuffer()
+    if kind == 'int':
+        return FloatBuffer(as_int=True)
+    if kind == 'float':
+        return FloatBuffer()
+    raise ValueError(f"unknown column kind '{kind}'")
+
+
+def float_column(buffer):
+    # Turn an array('d') into a float64 column without copying element by element
+    if not len(buffer):
+        return np.empty(0, dtype=np.float64)
+    return np.frombuffer(buffer, dtype=np.float64)
+
+
+def parse_elements(xml_file, handler):
+    """stream xml_file through expat and call handler(tag, attrib) on every opening tag
+
+    No element tree is built, so memory stays flat however large the file is.
+    """
+    parser = expat.ParserCreate()
+    parser.StartElementHandler = handler
+    with open(xml_file, 'rb') as xml:
+        parser.ParseFile(xml)
+
+
+def dump_xml_to_df(xml_file):
+    """read a netstate dump in one streaming pass, one row per vehicle and timestep"""
+    times, positions, speeds = array('d'), array('d'), array('d')
+    car_ids, edge_ids, lane_ids = CategoryBuffer(), CategoryBuffer(), CategoryBuffer()
+    current = {'time': None, 'edge': None, 'lane': None}
+
+    def on_element(tag, attrib):
+        if tag == 'vehicle':
+            times.append(current['time'])
+            car_ids.append(attrib['id'])
+            edge_ids.append(current['edge'])
+            lane_ids.append(current['lane'])
+            positions.append(float(attrib['pos']))
+            speeds.append(float(attrib['speed']))
+        elif tag == 'lane':
+            current['lane'] = attrib['id']
+        elif tag == 'edge':
+            current['edge'] = attrib['id']
+        elif tag == 'timestep':
+            current['time'] = float(attrib['time'])
+
+    parse_elements(xml_file, on_element)
+    return pd.DataFrame({'time': float_column(times),
+                         'carID': car_ids.to_categorical(),
+                         'edgeID': edge_ids.to_categorical(),
+                         'laneID': lane_ids.to_categorical(),
+                         'pos': float_column(positions),
+                         'speed': float_column(speeds)},
+                        columns=DUMP_COLUMNS)
+
+
+def elements_xml_to_df(xml_file, tag, schema, open_schema=False, open_ints=()):
+    """read every <tag> element of xml_file into one row, typed according to schema
+
+    schema is a list of (column, attribute, kind) with kind 'float', 'int' or 'category'.
+    Attributes missing on an element become NaN. With open_schema, attributes which are
+    not in the schema are added in the order they first appear, as int columns if they
+    are listed in open_ints and as float columns otherwise.
+    """
+    columns = [column for column, _, _ in schema]
+    fields = [(attribute, make_buffer(kind)) for _, attribute, kind in schema]
+    buffers = {attribute: buffer for attribute, buffer in fields}
+    rows = [0]
+
+    def on_element(name, attrib):
+        if name != tag:
+            return
+        if open_schema and not attrib.keys() <= buffers.keys():
+            for attribute in attrib:
+                if attribute not in buffers:
+                    buffer = FloatBuffer(as_int=attribute in open_ints)
+                    buffer.append_missing(rows[0])
+                    buffers[attribute] = buffer
+                    fields.append((attribute, buffer))
+                    columns.append(attribute)
+        for attribute, buffer in fields:
+            value = attrib.get(attribute)
+            if value is None:
+                buffer.append_missing()
+            else:
+                buffer.append(value)
+        rows[0] += 1
+
+    parse_elements(xml_file, on_element)
+    return pd.DataFrame({column: buffer.to_categorical() if isinstance(buffer, CategoryBuffer) else buffer.to_column()
+                         for column, (_, buffer) in zip(columns, fields)}, columns=columns)
+
+
+def tripinfo_xml_to_df(xml_file):
+    """read a tripinfo output, one row per vehicle"""
+    return elements_xml_to_df(xml_file, 'tripinfo', TRIPINFO_SCHEMA)
+
+
+def dump_edges_xml_to_df(xml_file):
+    """read an edgeData output (traffic or emissions), one row per edge and interval"""
+    return elements_xml_to_df(xml_file, 'edge', EDGEDATA_SCHEMA, open_schema=True, open_ints=EDGEDATA_COUNTS)
+
+
+def iter_stats(df_dump, df_trips, has_run, chunk_rows=STATS_CHUNK_ROWS):
+    """simulationStats in chunks of vehicle states, each joined with the trips of its cars
+
+    df_trips is the trip table of the round with onRouteAtStart, one row per car. Only one chunk
+    of the joined rows exists at a time, and there is always at least one, possibly empty, chunk.
+    """
+    columns = STATS_COLUMNS + ['onRouteAtStart']
+    for start in range(0, max(len(df_dump), 1), chunk_rows):
+        chunk = pd.merge(df_dump.iloc[start:start + chunk_rows], df_trips, on='carID', how='left')[columns]
+        chunk.insert(len(STATS_COLUMNS), 'HasRun', has_run)
+        yield chunk
+
+
+def last_states(df_dump, df_trips):
+    """vehicle states at the last time step with the route each car started the round on"""
+    df_last = df_dump.loc[df_dump['time'] == df_dump['time'].max()]
+    return pd.merge(df_last, df_trips[['carID', 'onRouteAtStart']], on='carID', how='left')
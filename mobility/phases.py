@@ -0,0 +1,111 @@
+# @author    Muzaffer Citir
+# @date      2026.10.18
+# @location  Berlin, Germany
+# @version   1.0
+
+# @brief   Wall time, CPU time and memory of the phases of a round, written as one record per round.
+#
+# Every phase records its wall and CPU seconds, the resident set size of the process after it and
+# by how much it raised the peak resident set size of the process, which is only known as the peak
+# over the whole lifetime of the process.
+# With trace_memory, tracemalloc also gives the peak of the memory allocated by Python within the
+# phase; it slows down allocation-heavy phases and is therefore opt-in.
+
+import csv
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+
+PHASE_FIELDS = ['HasRun', 'phase', 'seconds', 'cpu_seconds', 'rss_mb', 'max_rss_mb', 'max_rss_growth_mb',
+                'traced_peak_mb']
+
+
+def rss_mb():
+    # Current resident set size, from /proc where there is one
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1e6
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def max_rss_mb():
+    # Peak resident set size over the lifetime of the process, not of a phase
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / 1e6 if sys.platform == 'darwin' else peak / 1e3
+
+
+class PhaseTimer(object):
+    """measure consecutive phases: start(name) ends the running phase and begins the next one"""
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.phases = []
+        self.current = None
+        self.started = time.time()
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def start(self, name):
+        self.stop()
+        if self.trace_memory:
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+            else:
+                # Python 3.8 has no reset_peak, starting over also forgets the peak
+                tracemalloc.stop()
+                tracemalloc.start()
+        self.current = (name, time.perf_counter(), time.process_time(), max_rss_mb())
+
+    def stop(self):
+        if self.current is None:
+            return
+        name, wall_start, cpu_start, max_rss_start = self.current
+        max_rss = max_rss_mb()
+        phase = {'phase': name,
+                 'seconds': time.perf_counter() - wall_start,
+                 'cpu_seconds': time.process_time() - cpu_start,
+                 'rss_mb': rss_mb(),
+                 'max_rss_mb': max_rss,
+                 'max_rss_growth_mb': max_rss - max_rss_start if max_rss is not None else None,
+                 'traced_peak_mb': tracemalloc.get_traced_memory()[1] / 1e6 if self.trace_memory else None}
+        self.phases.append(phase)
+        self.current = None
+
+    def record(self, has_run, **extra):
+        """the phases of round has_run with their total, and extra values such as the fleet size"""
+        self.stop()
+        record = {'HasRun': has_run, 'started': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started)),
+                  'total_seconds': sum(phase['seconds'] for phase in self.phases)}
+        record.update(extra)
+        record['phases'] = self.phases
+        return record
+
+
+def write_phase_record(record, json_file, history_file=None):
+    """write the record of a round as JSON and append its phases to a CSV history of all rounds"""
+    for path in (json_file, history_file):
+        directory = os.path.dirname(path) if path else ''
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+    with open(json_file, 'w') as output:
+        json.dump(record, output, indent=4)
+    if history_file:
+        new_file = not os.path.exists(history_file)
+        with open(history_file, 'a', newline='') as history:
+            writer = csv.DictWriter(history, fieldnames=PHASE_FIELDS, extrasaction='ignore')
+            if new_file:
+                writer.writeheader()
+            for phase in record['phases']:
+                writer.writerow(dict(phase, HasRun=record['HasRun']))
@@ -0,0 +1,75 @@
+# @author    Muzaffer Citir
+# @date      2026.10.18
+# @location  Berlin, Germany
+# @version   1.0
+
+# @brief   PNG reports of the tables of a round, rendered off the critical path of the round.
+#
+# dataframe_image starts a browser or matplotlib for every picture, which takes longer than the
+# round itself. The reports are therefore rendered from the store by scripts/render_reports.py,
+# either in a detached process started at the end of the round or on demand, and dataframe_image
+# is only imported by the process which renders.
+
+import os
+import subprocess
+import sys
+
+# Table of the store -> name of the picture, stats/0<HasRun>_<name>.png
+REPORTS = {'dump': 'df_dump_xml', 'dump_edges': 'df_dump_edges_xml', 'dump_edges_co2': 'df_dump_edges_co2_xml',
+           'tripinfo': 'df_tripinfo_xml', 'simulationStats': 'df_stats'}
+
+RENDER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts', 'render_reports.py')
+
+
+def report_file(table, has_run, directory='stats'):
+    return os.path.join(directory, f'0{has_run}_{REPORTS[table]}.png')
+
+
+def stats_preview(df_dump, df_trips, has_run, rows=15):
+    """head and tail of simulationStats of a round, joined only for the rows a report shows"""
+    import pandas as pd
+    from mobility.parsers import iter_stats
+    if len(df_dump) > 2 * rows:
+        df_dump = pd.concat([df_dump.head(rows), df_dump.tail(rows)])
+    df_stats = next(iter_stats(df_dump, df_trips, has_run))
+    df_stats.index = df_dump.index
+    return df_stats
+
+
+def render_round(tables, has_run, directory='stats', max_rows=30):
+    """render the tables of round has_run to stats/0<HasRun>_*.png in this process"""
+    import dataframe_image as dfi
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+    for table, df in tables.items():
+        if table in REPORTS:
+            dfi.export(df, report_file(table, has_run, directory), max_rows=max_rows)
+
+
+def render_from_store(store, has_run, directory='stats', max_rows=30, force=False):
+    """render the reports of a round of the store which do not exist yet, return the tables rendered"""
+    tables = {}
+    for table in REPORTS:
+        if not force and os.path.exists(report_file(table, has_run, directory)):
+            continue
+        if table == 'simulationStats':
+            # simulationStats is not stored, the rows of the report are joined from the round
+            df = stats_preview(store.read('dump', has_run).drop(columns=['HasRun']), store.trips(has_run), has_run)
+        else:
+            # Only the vehicle states had a HasRun column in the round
+            df = store.read(table, has_run).drop(columns=['HasRun'])
+        tables[table] = df
+    render_round(tables, has_run, directory, max_rows)
+    return list(tables)
+
+
+def render_in_background(store_root, has_run, directory='stats'):
+    """start a detached process which renders the reports of round has_run; the round does not wait for it"""
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+    log = open(os.path.join(directory, 'render.log'), 'a')
+    process = subprocess.Popen([sys.executable, RENDER_SCRIPT, '--store', store_root, '--stats', directory,
+                                '--round', str(has_run)],
+                               stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+    log.close()
+    return process
@@ -0,0 +1,180 @@
+# @author    Muzaffer Citir
+# @date      2026.10.18
+# @location  Berlin, Germany
+# @version   1.0
+
+# @brief   Route library of a net: fastest route between every origin and destination edge, cached on disk.
+#
+# Origins are the edges which leave a fringe node of the net, destinations the edges which end in
+# one. A fringe node connects to one other node only, e.g. a dead end, also when netconvert gave it
+# a turnaround. Instead a list of edges can be given, each of them then origin and destination. The
+# routes are found with one Dijkstra per origin on free-flow travel times and stored in
+# cache/routes_<hash of the net file>.npz, so they are only computed again when the net changes.
+
+import hashlib
+import heapq
+import os
+import random
+
+import numpy as np
+
+CACHE_DIR = 'cache'
+
+
+def net_hash(net_file):
+    digest = hashlib.sha1()
+    with open(net_file, 'rb') as net_input:
+        for block in iter(lambda: net_input.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def fastest_routes(net, origin, destinations, vclass='passenger'):
+    """destination -> (edge IDs, travel time) of the fastest route from origin, for the reachable destinations"""
+    def travel_time(edge):
+        return edge.getLength() / edge.getSpeed()
+
+    times = {origin: travel_time(origin)}
+    previous = {}
+    queue = [(times[origin], origin.getID(), origin)]
+    while queue:
+        time_, _, edge = heapq.heappop(queue)
+        if time_ > times[edge]:
+            continue
+        for next_edge in edge.getOutgoing():
+            if not next_edge.allows(vclass):
+                continue
+            next_time = time_ + travel_time(next_edge)
+            if next_time < times.get(next_edge, float('inf')):
+                times[next_edge] = next_time
+                previous[next_edge] = edge
+                heapq.heappush(queue, (next_time, next_edge.getID(), next_edge))
+    routes = {}
+    for destination in destinations:
+        if destination not in times or destination is origin:
+            continue
+        edges = [destination]
+        while edges[-1] is not origin:
+            edges.append(previous[edges[-1]])
+        routes[destination] = ([edge.getID() for edge in reversed(edges)], times[destination])
+    return routes
+
+
+def fringe_node(node):
+    # The node leads to and comes from one neighbour at most, with or without a turnaround
+    neighbours = ({edge.getFromNode().getID() for edge in node.getIncoming()} |
+                  {edge.getToNode().getID() for edge in node.getOutgoing()})
+    neighbours.discard(node.getID())
+    return len(neighbours) <= 1
+
+
+def build_routes(net_file, vclass='passenger', endpoints=None):
+    """(route IDs, edge lists, travel times, edge lengths) of the fastest route between every origin and destination
+
+    endpoints are the IDs of the edges to use as origins and destinations instead of the fringe of the net.
+    """
+    import sumolib
+    net = sumolib.net.readNet(net_file)
+    edges = sorted((edge for edge in net.getEdges(withInternal=False) if edge.allows(vclass)),
+                   key=lambda edge: edge.getID())
+    if endpoints:
+        unknown = set(endpoints) - {edge.getID() for edge in edges}
+        if unknown:
+            raise ValueError(f"no {vclass} edges of {net_file}: {', '.join(sorted(unknown))}")
+        origins = destinations = [edge for edge in edges if edge.getID() in set(endpoints)]
+    else:
+        origins = [edge for edge in edges if fringe_node(edge.getFromNode())]
+        destinations = [edge for edge in edges if fringe_node(edge.getToNode())]
+    route_ids, route_edges, route_times = [], [], []
+    for origin in origins:
+        for destination, (edge_ids, travel_time) in fastest_routes(net, origin, destinations, vclass).items():
+            route_ids.append(f'{origin.getID()}_to_{destination.getID()}')
+            route_edges.append(edge_ids)
+            route_times.append(travel_time)
+    if not route_ids:
+        raise ValueError(f"no {vclass} routes between the origins and destinations of {net_file}, "
+                         "give the edges to route between with --route-endpoints")
+    return route_ids, route_edges, route_times, {edge.getID(): edge.getLength() for edge in edges}
+
+
+def fixed_route_library(routes, net_file):
+    """library of given routes, e.g. fleet.ROUTES, with the edge lengths of net_file"""
+    import sumolib
+    net = sumolib.net.readNet(net_file)
+    lengths = {edge: net.getEdge(edge).getLength() for edges in routes.values() for edge in edges}
+    times = [sum(net.getEdge(edge).getLength() / net.getEdge(edge).getSpeed() for edge in edges)
+             for edges in routes.values()]
+    return RouteLibrary(list(routes), list(routes.values()), times, edge_lengths=lengths)
+
+
+class RouteLibrary(object):
+    """routes of a net with a sampling weight each"""
+
+    def __init__(self, route_ids, route_edges, travel_times, weights=None, edge_lengths=None):
+        self.route_ids = list(route_ids)
+        self.routes = dict(zip(self.route_ids, route_edges))
+        self.travel_times = np.asarray(travel_times, dtype=float)
+        self.edge_lengths = edge_lengths or {}
+        # Length of the first edge of every route, where the vehicles are inserted
+        self.first_lengths = np.array([self.edge_lengths.get(self.routes[route][0], 0.0)
+                                       for route in self.route_ids])
+        self.set_weights(weights)
+
+    def set_weights(self, weights=None):
+        # Uniform without weights; the cumulative weights make one sample a binary search
+        weights = np.ones(len(self.route_ids)) if weights is None else np.asarray(weights, dtype=float)
+        self.cumulative = np.cumsum(weights) / weights.sum()
+
+    def sample(self, count, rng=random):
+        """route IDs for count vehicles, drawn at once
+
+        The numpy generator is seeded from rng, so restoring the state of rng replays the draw.
+        """
+        return [self.route_ids[pick] for pick in self.sample_indices(count, rng)]
+
+    def sample_indices(self, count, rng=random):
+        # Positions of the drawn routes in route_ids
+        if not self.route_ids:
+            raise ValueError("the route library has no routes to sample from")
+        generator = np.random.default_rng(rng.getrandbits(64))
+        picks = np.searchsorted(self.cumulative, generator.random(count), side='right')
+        return np.minimum(picks, len(self.route_ids) - 1)
+
+    def save(self, cache_file):
+        # Edge IDs once, routes as positions into them: a compact file even for many routes
+        edge_ids = sorted({edge for edges in self.routes.values() for edge in edges})
+        positions = {edge: position for position, edge in enumerate(edge_ids)}
+        flat = np.array([positions[edge] for route in self.route_ids for edge in self.routes[route]], dtype=np.int32)
+        offsets = np.cumsum([0] + [len(self.routes[route]) for route in self.route_ids]).astype(np.int64)
+        directory = os.path.dirname(cache_file)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with open(cache_file + '.tmp', 'wb') as output:
+            np.savez_compressed(output, route_ids=np.array(self.route_ids), edge_ids=np.array(edge_ids),
+                                flat=flat, offsets=offsets, travel_times=self.travel_times,
+                                edge_lengths=np.array([self.edge_lengths.get(edge, 0.0) for edge in edge_ids]))
+        os.replace(cache_file + '.tmp', cache_file)
+
+    @classmethod
+    def load(cls, cache_file):
+        with np.load(cache_file) as cache:
+            edge_ids = cache['edge_ids'].tolist()
+            flat, offsets = cache['flat'], cache['offsets']
+            route_edges = [[edge_ids[position] for position in flat[offsets[i]:offsets[i + 1]]]
+                           for i in range(len(offsets) - 1)]
+            edge_lengths = dict(zip(edge_ids, cache['edge_lengths'].tolist()))
+            return cls(cache['route_ids'].tolist(), route_edges, cache['travel_times'], edge_lengths=edge_lengths)
+
+
+def load_route_library(net_file, cache_dir=CACHE_DIR, vclass='passenger', endpoints=None):
+    """route library of net_file, from the cache if the net and the endpoints have not changed since it was built"""
+    key = net_hash(net_file)
+    if endpoints:
+        key = hashlib.sha1(','.join([key] + sorted(endpoints)).encode()).hexdigest()
+    cache_file = os.path.join(cache_dir, f'routes_{vclass}_{key[:16]}.npz')
+    if os.path.exists(cache_file):
+        return RouteLibrary.load(cache_file)
+    route_ids, route_edges, route_times, edge_lengths = build_routes(net_file, vclass, endpoints)
+    library = RouteLibrary(route_ids, route_edges, route_times, edge_lengths=edge_lengths)
+    library.save(cache_file)
+    return library
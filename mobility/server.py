@@ -0,0 +1,157 @@
+# @author    Muzaffer Citir
+# @date      2026.10.18
+# @location  Berlin, Germany
+# @version   1.0
+
+# @brief   Round server which keeps one SUMO/TraCI session alive across game rounds.
+#
+# Every request is one JSON object per line and is answered with one JSON object per line:
+#   {"cmd": "round", "steps": 101}   advance the simulation by one game round
+#   {"cmd": "state"}                 report the current state without stepping
+#   {"cmd": "quit"}                  close SUMO and stop serving
+# The requests are read from stdin, or from a local TCP socket when a port is given. stdout only
+# carries the answers, everything else of run.py and SUMO goes to stderr.
+
+import json
+import random
+import socket
+import sys
+
+import traci
+
+from mobility.fleet import VTYPE, register_vtype
+from mobility.stepping import Stepper, write_metrics
+
+
+class RoundServer(object):
+    """advance one live simulation by a game round per request"""
+
+    def __init__(self, routes, has_run=1, round_steps=101, stepper=None, metrics_file=None,
+                 vtypes=None, vtypes_of_cars=None, library=None):
+        self.routes = routes
+        self.route_ids = list(routes.keys())
+        self.library = library
+        self.has_run = has_run
+        self.round_steps = round_steps
+        self.stepper = stepper or Stepper()
+        self.stepper.add_listener(self.collect_arrived)
+        self.metrics_file = metrics_file
+        # vTypes of the route file or of the demand, the first one is the default; a car keeps its vType
+        self.vtypes = vtypes or [VTYPE]
+        self.vtypes_of_cars = dict(vtypes_of_cars or {})
+        # Vehicles which completed their route and get a new one at the start of the next round
+        self.arrived = []
+        self.arrived_this_round = []
+
+    def start(self, sumo_cmd):
+        # No end time, otherwise SUMO stops at the end given in straight.sumocfg. The answers go to
+        # stdout, so SUMO logs no steps and writes its messages to stderr
+        traci.start(sumo_cmd + ["--end", "-1", "--no-step-log"], stdout=sys.stderr)
+
+    def close(self):
+        traci.close()
+        sys.stdout.flush()
+
+    def reassign_arrived(self):
+        # Same as a new file-based round: a vehicle which finished its route picks a new one. The cars
+        # leave the list first, so a car which cannot be added fails one round and not every later one
+        reassigned, self.arrived = self.arrived, []
+        if not reassigned:
+            return reassigned
+        if self.library is not None:
+            new_routes = self.library.sample(len(reassigned))
+        else:
+            new_routes = [random.choice(self.route_ids) for car in reassigned]
+        for vtype in self.vtypes:
+            register_vtype(vtype)
+        default_type = self.vtypes[0]['id']
+        for car, route in zip(reassigned, new_routes):
+            traci.vehicle.add(car, route, typeID=self.vtypes_of_cars.get(car) or default_type, depart='now')
+        return reassigned
+
+    def collect_arrived(self, step):
+        self.arrived_this_round.extend(traci.simulation.getArrivedIDList())
+
+    def run_round(self, steps=None):
+        steps = self.round_steps if steps is None else int(steps)
+        reassigned = self.reassign_arrived()
+        self.arrived_this_round = []
+        self.stepper.run(steps)
+        self.arrived.extend(self.arrived_this_round)
+        metrics = self.stepper.metrics()
+        if self.metrics_file:
+            write_metrics(metrics, self.metrics_file)
+        report = self.state()
+        report.update({'reassigned': reassigned, 'arrived': self.arrived_this_round, 'metrics': metrics})
+        self.has_run += 1
+        return report
+
+    def state(self):
+        edges = {}
+        for edge in traci.edge.getIDList():
+            if edge.startswith(':'):
+                # Internal junction edges are not part of the game map
+                continue
+            edges[edge] = {'vehicles': traci.edge.getLastStepVehicleNumber(edge),
+                           'speed': traci.edge.getLastStepMeanSpeed(edge),
+                           'CO2': traci.edge.getCO2Emission(edge)}
+        vehicles = {}
+        for car in traci.vehicle.getIDList():
+            vehicles[car] = {'route': traci.vehicle.getRouteID(car),
+                             'edgeID': traci.vehicle.getRoadID(car),
+                             'laneID': traci.vehicle.getLaneID(car),
+                             'pos': traci.vehicle.getLanePosition(car),
+                             'speed': traci.vehicle.getSpeed(car)}
+        return {'HasRun': self.has_run, 'time': traci.simulation.getTime(),
+                'vehicles': vehicles, 'edges': edges}
+
+    def handle(self, request):
+        command = request.get('cmd')
+        if command == 'round':
+            steps = request.get('steps')
+            if steps is not None and (not isinstance(steps, int) or isinstance(steps, bool) or steps < 0):
+                return {'ok': False, 'error': f"steps must be a non-negative integer, not {steps!r}"}
+            return dict(ok=True, **self.run_round(steps))
+        if command == 'state':
+            return dict(ok=True, **self.state())
+        if command == 'quit':
+            return {'ok': True}
+        return {'ok': False, 'error': f"unknown command '{command}'"}
+
+
+def serve_stream(server, stream_in, stream_out):
+    """answer requests line by line until 'quit' or the end of the input, return True on 'quit'"""
+    for line in stream_in:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                # Valid JSON, but not a request object such as {"cmd": "round"}
+                raise ValueError(f"request is not a JSON object: {line}")
+            response = server.handle(request)
+        except (ValueError, traci.TraCIException) as error:
+            request, response = {}, {'ok': False, 'error': str(error)}
+        stream_out.write(json.dumps(response) + '\n')
+        stream_out.flush()
+        if request.get('cmd') == 'quit':
+            return True
+    return False
+
+
+def serve(server, port=None):
+    """serve requests from stdin, or from clients connecting to 127.0.0.1:port one at a time"""
+    try:
+        if port is None:
+            serve_stream(server, sys.stdin, sys.stdout)
+            return
+        with socket.create_server(('127.0.0.1', port)) as listener:
+            print(f"Round server listening on 127.0.0.1:{port}", file=sys.stderr)
+            while True:
+                connection, _ = listener.accept()
+                with connection, connection.makefile('r') as reader, connection.makefile('w') as writer:
+                    if serve_stream(server, reader, writer):
+                        return
+    finally:
+        server.close()
@@ -0,0 +1,125 @@
+# @author    Muzaffer Citir
+# @date      2026.10.18
+# @location  Berlin, Germany
+# @version   1.0
+
+# @brief   Stepping engine for a game round: optional wall-clock pacing and per-step timing.
+
+from array import array
+import json
+import math
+import os
+import time
+
+import traci
+import traci.constants as tc
+
+# Variables of the vehicle subscriptions the Stepper makes for its listeners (StateCollector,
+# EventEngine, LiveFeed): every variable one of them reads, since a new subscription of a vehicle
+# would replace the one before
+VEHICLE_VARIABLES = [tc.VAR_ROAD_ID, tc.VAR_LANE_ID, tc.VAR_LANEPOSITION, tc.VAR_SPEED, tc.VAR_ROUTE_ID,
+                     tc.VAR_ROUTE_INDEX, tc.VAR_POSITION, tc.VAR_ANGLE, tc.VAR_CO2EMISSION]
+
+
+def subscribe_vehicles(cars):
+    # A subscription ends when the vehicle arrives, so a reused carID is subscribed again
+    for car in cars:
+        traci.vehicle.subscribe(car, VEHICLE_VARIABLES)
+
+
+def percentile(sorted_values, q):
+    # Nearest-rank percentile of an already sorted sequence
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(math.ceil(q / 100.0 * len(sorted_values))))
+    return sorted_values[rank - 1]
+
+
+class Stepper(object):
+    """advance the simulation step by step and time every step
+
+    step_delay is the wall-clock time one simulation step should take at least, e.g. 0.05 to
+    follow the vehicles in sumo-gui. With 0 the simulation runs as fast as possible.
+    Listeners are called as listener(step) after every simulation step. If one of them has
+    subscribes_vehicles set, every vehicle is subscribed to VEHICLE_VARIABLES when it departs, once
+    per step before the listeners run, and the simulation to the time and the departed vehicles.
+    The listeners then read traci.vehicle.getAllSubscriptionResults().
+    """
+
+    def __init__(self, step_delay=0.0):
+        self.step_delay = step_delay
+        self.listeners = []
+        self.subscribed = False
+        self.reset()
+
+    def reset(self):
+        self.step_seconds = array('d')
+        self.traci_seconds = array('d')
+        self.wall_seconds = 0.0
+        self.start_time = None
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def subscribe(self):
+        if not self.subscribed:
+            # Vehicles put on the network before the first step (e.g. moved there by TraCI) do not
+            # show up as departed, so everything present is subscribed once. In a RoundServer the
+            # subscriptions go on from round to round
+            self.subscribed = True
+            traci.simulation.subscribe([tc.VAR_TIME, tc.VAR_DEPARTED_VEHICLES_IDS])
+            subscribe_vehicles(traci.vehicle.getIDList())
+        else:
+            subscribe_vehicles(traci.simulation.getSubscriptionResults()[tc.VAR_DEPARTED_VEHICLES_IDS])
+
+    def run(self, steps):
+        self.reset()
+        clock = time.perf_counter
+        start = deadline = clock()
+        self.start_time = time.time()
+        subscribing = any(getattr(listener, 'subscribes_vehicles', False) for listener in self.listeners)
+        for step in range(steps):
+            step_start = clock()
+            traci.simulationStep()
+            traci_end = clock()
+            if subscribing:
+                self.subscribe()
+            for listener in self.listeners:
+                listener(step)
+            step_end = clock()
+            self.traci_seconds.append(traci_end - step_start)
+            self.step_seconds.append(step_end - step_start)
+            if self.step_delay:
+                # Sleep only for what is left of this step's time slot, so pacing does not drift
+                deadline += self.step_delay
+                remaining = deadline - clock()
+                if remaining > 0:
+                    time.sleep(remaining)
+        self.wall_seconds = clock() - start
+
+    def metrics(self):
+        steps = len(self.step_seconds)
+        step_seconds = sorted(self.step_seconds)
+        traci_seconds = sorted(self.traci_seconds)
+        busy_seconds = sum(step_seconds)
+        return {'steps': steps,
+                'step_delay': self.step_delay,
+                'wall_seconds': self.wall_seconds,
+                'steps_per_sec': steps / self.wall_seconds if self.wall_seconds else 0.0,
+                'unpaced_steps_per_sec': steps / busy_seconds if busy_seconds else 0.0,
+                'step_p50_ms': percentile(step_seconds, 50) * 1000,
+                'step_p99_ms': percentile(step_seconds, 99) * 1000,
+                'traci_seconds': sum(traci_seconds),
+                'traci_p50_ms': percentile(traci_seconds, 50) * 1000,
+                'traci_p99_ms': percentile(traci_seconds, 99) * 1000,
+                'rounds_per_minute': 60.0 / self.wall_seconds if self.wall_seconds else 0.0,
+                # Unix time at which the first simulation step returned, to measure the startup of a round
+                'first_step_time': self.start_time + self.traci_seconds[0] if steps else None}
+
+
+def write_metrics(metrics, metrics_file):
+    directory = os.path.dirname(metrics_file)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    with open(metrics_file, 'w') as output:
+        json.dump(metrics, output, indent=4)
@@ -0,0 +1,163 @@
+# @author    Muzaffer Citir
+# @date      2026.10.18
+# @location  Berlin, Germany
+# @version   1.0
+
+# @brief   Columnar round history: one compressed Parquet file per table and round.
+#
+# Layout: <root>/<table>/HasRun=<n>/part.parquet. The round number lives in the directory name
+# (hive partitioning), so a query on HasRun only opens the matching directories, and the rows are
+# stored in time order in row groups, so a query on time skips row groups by their statistics.
+
+import csv
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from mobility.parsers import iter_stats, last_states
+
+# The vehicle states of every step (dump) and one row per trip (tripinfo, with onRouteAtStart) are
+# stored apart; simulationStats, their join, is only built on demand
+TABLES = ['dump', 'tripinfo', 'dump_edges', 'dump_edges_co2']
+
+# Types of the columns of csv/simulationStats.csv which must not be read as numbers
+STATS_DTYPES = {'carID': str, 'edgeID': str, 'laneID': str, 'onRouteAtStart': str}
+
+# SUMO writes two decimals for the vehicle values, the emission values need all of theirs
+CSV_FLOAT_FORMAT = {'simulationStats': '%.2f', 'dump': '%.2f', 'tripinfo': '%.2f'}
+
+ROW_GROUP_SIZE = 64 * 1024
+
+
+class RoundStore(object):
+    """read and write the output tables of every round"""
+
+    def __init__(self, root='store'):
+        self.root = root
+
+    def partition(self, table, has_run):
+        return os.path.join(self.root, table, f'HasRun={has_run}')
+
+    def part_file(self, table, has_run):
+        return os.path.join(self.partition(table, has_run), 'part.parquet')
+
+    def write_round(self, tables, has_run):
+        """write every table of round has_run; a file only becomes visible once completely written"""
+        for table, df in tables.items():
+            directory = self.partition(table, has_run)
+            if not os.path.exists(directory):
+                os.makedirs(directory)
+            # HasRun is given by the directory, so it is not stored again in every row
+            df = df.drop(columns=['HasRun'], errors='ignore')
+            arrow_table = pa.Table.from_pandas(df, preserve_index=False)
+            part_file = self.part_file(table, has_run)
+            pq.write_table(arrow_table, part_file + '.tmp', compression='zstd', row_group_size=ROW_GROUP_SIZE)
+            os.replace(part_file + '.tmp', part_file)
+
+    def rounds(self, table='dump'):
+        directory = os.path.join(self.root, table)
+        if not os.path.exists(directory):
+            return []
+        rounds = []
+        for name in os.listdir(directory):
+            if name.startswith('HasRun=') and os.path.exists(os.path.join(directory, name, 'part.parquet')):
+                rounds.append(int(name.split('=', 1)[1]))
+        return sorted(rounds)
+
+    def latest_round(self, table='dump'):
+        rounds = self.rounds(table)
+        return rounds[-1] if rounds else None
+
+    def read(self, table, has_run=None, columns=None, where=None):
+        """read a table, from one round only if has_run is given, with an optional pyarrow.dataset filter"""
+        if has_run is not None:
+            # Straight to the one file, no need to discover all other rounds
+            df = ds.dataset(self.part_file(table, has_run), format='parquet').to_table(
+                columns=columns, filter=where).to_pandas()
+            if columns is None or 'HasRun' in columns:
+                df['HasRun'] = has_run
+            return df
+        dataset = ds.dataset(os.path.join(self.root, table), format='parquet', partitioning='hive')
+        return dataset.to_table(columns=columns, filter=where).to_pandas()
+
+    def column_max(self, table, has_run, column):
+        # Maximum of a column from the row group statistics, without reading any data
+        metadata = pq.ParquetFile(self.part_file(table, has_run)).metadata
+        index = metadata.schema.names.index(column)
+        maxima = []
+        for row_group in range(metadata.num_row_groups):
+            statistics = metadata.row_group(row_group).column(index).statistics
+            if statistics is None or not statistics.has_min_max:
+                return self.read(table, has_run, columns=[column])[column].max()
+            maxima.append(statistics.max)
+        return max(maxima) if maxima else None
+
+    def trips(self, has_run):
+        return self.read('tripinfo', has_run).drop(columns=['HasRun'])
+
+    def iter_stats(self, has_run, batch_size=ROW_GROUP_SIZE):
+        """simulationStats of round has_run in chunks, joined from the vehicle states and the trips"""
+        trips = self.trips(has_run)
+        dataset = ds.dataset(self.part_file('dump', has_run), format='parquet')
+        for batch in dataset.to_batches(batch_size=batch_size):
+            for chunk in iter_stats(batch.to_pandas(), trips, has_run, batch_size):
+                yield chunk
+
+    def stats(self, has_run):
+        """simulationStats of round has_run in one DataFrame"""
+        return pd.concat(list(self.iter_stats(has_run)), ignore_index=True)
+
+    def last_state(self, has_run):
+        """vehicle states at the last time step of round has_run, with onRouteAtStart"""
+        last_time = self.column_max('dump', has_run, 'time')
+        df_last = self.read('dump', has_run, where=ds.field('time') == last_time)
+        return last_states(df_last, self.trips(has_run))
+
+
+def export_csv(tables, has_run, directory='csv'):
+    """write the tables as csv/<table>.csv and csv/history/0<HasRun>_<table>.csv
+
+    simulationStats is joined from dump and tripinfo and written chunk by chunk.
+    """
+    history = os.path.join(directory, 'history')
+    if not os.path.exists(history):
+        os.makedirs(history)
+    for table, df in tables.items():
+        for path in (os.path.join(directory, f'{table}.csv'), os.path.join(history, f'0{has_run}_{table}.csv')):
+            pd.DataFrame.to_csv(df, path, index=False, quoting=csv.QUOTE_ALL,
+                                float_format=CSV_FLOAT_FORMAT.get(table))
+    if 'dump' in tables and 'tripinfo' in tables:
+        for number, chunk in enumerate(iter_stats(tables['dump'], tables['tripinfo'], has_run)):
+            for path in (os.path.join(directory, 'simulationStats.csv'),
+                         os.path.join(history, f'0{has_run}_simulationStats.csv')):
+                pd.DataFrame.to_csv(chunk, path, mode='w' if number == 0 else 'a', header=number == 0, index=False,
+                                    quoting=csv.QUOTE_ALL, float_format=CSV_FLOAT_FORMAT['simulationStats'])
+
+
+def load_previous_round(store, csv_dir='csv'):
+    """(HasRun, vehicle states at its last time step, carIDs of the fleet) of the previous round, or None
+
+    The store is used when it has a round, otherwise the csv files of earlier versions.
+    """
+    has_run = store.latest_round()
+    if has_run is not None:
+        df_stats_last_time = store.last_state(has_run)
+        carIDs = pd.concat([store.read('dump', has_run, columns=['carID'])['carID'].astype(str),
+                            store.read('tripinfo', has_run, columns=['carID'])['carID'].astype(str)])
+    else:
+        stats_file = os.path.join(csv_dir, 'simulationStats.csv')
+        if not os.path.exists(stats_file):
+            return None
+        df_stats = pd.read_csv(stats_file, keep_default_na=False, dtype=STATS_DTYPES)
+        df_stats_last_time = df_stats.loc[df_stats['time'] == df_stats['time'].tail(1).tolist()[0]]
+        has_run = int(df_stats_last_time['HasRun'].tolist()[0])
+        carIDs = df_stats['carID']
+        tripinfo_file = os.path.join(csv_dir, 'tripinfo.csv')
+        if os.path.exists(tripinfo_file):
+            carIDs = pd.concat([carIDs, pd.read_csv(tripinfo_file, usecols=['carID'], dtype=str)['carID']])
+    # The fleet is every car of the previous round, including the ones which completed their route;
+    # the trip info has them all even when only the last step of the vehicle states was kept
+    return has_run, df_stats_last_time, pd.unique(carIDs).tolist()
@@ -0,0 +1,104 @@
+# @author    Muzaffer Citir
+# @date      2026.10.18
+# @location  Berlin, Germany
+# @version   1.0
+
+# @brief   Writers for synthetic SUMO output files, used by the benchmarks in scripts/.
+
+import random
+
+EDGES = ['E0', 'E12', 'E4', 'E7', '-E7', '-E4', '-E12', '-E0', '-E6', 'E2']
+
+
+def write_dump(xml_file, n_vehicles, n_steps, edges=None, lanes_per_edge=3, seed=42):
+    """write a netstate dump with n_vehicles driving on every one of n_steps timesteps"""
+    rng = random.Random(seed)
+    edges = edges or EDGES
+    with open(xml_file, 'w') as dump:
+        print('<?xml version="1.0" encoding="UTF-8"?>', file=dump)
+        print('<netstate>', file=dump)
+        for step in range(n_steps):
+            print(f'    <timestep time="{step:.2f}">', file=dump)
+            # Spread the fleet over the edges, with every vehicle on the first lane of its edge
+            on_edge = {}
+            for car in range(n_vehicles):
+                on_edge.setdefault(edges[(car + step) % len(edges)], []).append(car)
+            for edge, cars in on_edge.items():
+                print(f'        <edge id="{edge}">', file=dump)
+                print(f'            <lane id="{edge}_0">', file=dump)
+                for car in cars:
+                    print(f'                <vehicle id="car{car}" pos="{rng.uniform(0, 200):.2f}" '
+                          f'speed="{rng.uniform(0, 14):.2f}"/>', file=dump)
+                print('            </lane>', file=dump)
+                for lane in range(1, lanes_per_edge):
+                    print(f'            <lane id="{edge}_{lane}"/>', file=dump)
+                print('        </edge>', file=dump)
+            print('    </timestep>', file=dump)
+        print('</netstate>', file=dump)
+
+
+def make_edges(n_edges):
+    """IDs of n_edges edges: the edges of straight.net.xml, then made-up ones"""
+    if n_edges <= len(EDGES):
+        return EDGES[:n_edges]
+    return EDGES + [f'X{i}' for i in range(n_edges - len(EDGES))]
+
+
+def write_tripinfo(xml_file, n_vehicles, n_steps, edges=None, seed=42):
+    """write a tripinfo output for n_vehicles, a third of them arrived and the others unfinished"""
+    rng = random.Random(seed)
+    edges = edges or EDGES
+    with open(xml_file, 'w') as tripinfo:
+        print('<?xml version="1.0" encoding="UTF-8"?>', file=tripinfo)
+        print('<tripinfos>', file=tripinfo)
+        for car in range(n_vehicles):
+            depart = rng.uniform(0, n_steps / 2)
+            if car % 3 == 0:
+                arrival = rng.uniform(depart, n_steps)
+                end = (f'arrival="{arrival:.2f}" arrivalLane="{edges[(car + 1) % len(edges)]}_0" '
+                       f'arrivalPos="{rng.uniform(0, 200):.2f}" arrivalSpeed="{rng.uniform(0, 14):.2f}" '
+                       f'duration="{arrival - depart:.2f}"')
+                vaporized = ''
+            else:
+                end = (f'arrival="-1.00" arrivalLane="" arrivalPos="-1.00" arrivalSpeed="-1.00" '
+                       f'duration="{n_steps - depart:.2f}"')
+                vaporized = 'end'
+            print(f'    <tripinfo id="car{car}" depart="{depart:.2f}" departLane="{edges[car % len(edges)]}_0" '
+                  f'departPos="0.00" departSpeed="0.00" departDelay="{rng.uniform(0, 2):.2f}" {end} '
+                  f'routeLength="{rng.uniform(100, 1000):.2f}" waitingTime="{rng.uniform(0, 10):.2f}" '
+                  f'waitingCount="0" stopTime="0.00" timeLoss="{rng.uniform(0, 30):.2f}" rerouteNo="0" '
+                  f'devices="tripinfo_car{car}" vType="passenger1" speedFactor="{rng.uniform(0.8, 1.2):.2f}" '
+                  f'vaporized="{vaporized}"/>', file=tripinfo)
+        print('</tripinfos>', file=tripinfo)
+
+
+def write_edge_data(xml_file, edges=None, n_intervals=1, interval=101, emissions=False, seed=42):
+    """write an edgeData output, traffic or emissions, with every edge in each of n_intervals intervals"""
+    rng = random.Random(seed)
+    edges = edges or EDGES
+    with open(xml_file, 'w') as edge_data:
+        print('<?xml version="1.0" encoding="UTF-8"?>', file=edge_data)
+        print('<meandata>', file=edge_data)
+        for number in range(n_intervals):
+            print(f'    <interval begin="{number * interval:.2f}" end="{(number + 1) * interval:.2f}" '
+                  f'id="{"edgeStatsEmissions" if emissions else "edgeStats"}">', file=edge_data)
+            for edge in edges:
+                sampled = rng.uniform(0, 500)
+                if emissions:
+                    values = ' '.join(f'{pollutant}_{kind}="{rng.uniform(0, 1e5):.6f}"'
+                                      for kind in ('abs', 'normed', 'perVeh')
+                                      for pollutant in ('CO', 'CO2', 'HC', 'PMx', 'NOx', 'fuel', 'electricity'))
+                    print(f'        <edge id="{edge}" sampledSeconds="{sampled:.2f}" {values} '
+                          f'traveltime="{rng.uniform(10, 120):.2f}"/>', file=edge_data)
+                else:
+                    print(f'        <edge id="{edge}" sampledSeconds="{sampled:.2f}" '
+                          f'traveltime="{rng.uniform(10, 120):.2f}" overlapTraveltime="{rng.uniform(10, 120):.2f}" '
+                          f'density="{rng.uniform(0, 20):.2f}" laneDensity="{rng.uniform(0, 7):.2f}" '
+                          f'occupancy="{rng.uniform(0, 3):.2f}" waitingTime="{rng.uniform(0, 5):.2f}" '
+                          f'timeLoss="{rng.uniform(0, 40):.2f}" speed="{rng.uniform(0, 14):.2f}" '
+                          f'speedRelative="{rng.uniform(0, 1):.2f}" departed="{rng.randint(0, 5)}" '
+                          f'arrived="{rng.randint(0, 5)}" entered="{rng.randint(0, 10)}" '
+                          f'left="{rng.randint(0, 10)}" laneChangedFrom="{rng.randint(0, 8)}" '
+                          f'laneChangedTo="{rng.randint(0, 8)}"/>', file=edge_data)
+            print('    </interval>', file=edge_data)
+        print('</meandata>', file=edge_data)
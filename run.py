@@ -14,16 +14,6 @@ import os
 import sys
 import optparse
 import random
-import time
-import sumolib.statistics
-from sumolib.xml import parse_fast_nested, parse_fast_structured
-from collections import OrderedDict
-import requests
-import xml.etree.ElementTree as ET
-import pandas as pd
-import xmltodict
-import numpy as np
-import shutil
 
 # we need to import python modules from the $SUMO_HOME/tools directory
 if 'SUMO_HOME' in os.environ:
@@ -34,188 +24,27 @@ else:
 
 from sumolib import checkBinary  #
 import traci  # noqa
-import csv
-import dataframe_image as dfi
-
-
-def parse_xml(xml_file):
-    # parse the xml file
-    tree = ET.parse(xml_file)
-    root = tree.getroot()
-    return root
-
-
-def random_route(routes):
-    selected_route = [random.choice(list(routes.keys()))]
-    return selected_route
-
-
-def get_order_in_datalist(datalist, key):
-    return datalist.index(key)
-
-
-def concat_list_elements(datalist):
-    return ' '.join(['{}'.format(item) for item in datalist])
-
-
-def get_property(car, property_, stats):
-    # get the property of the car
-    property_of_car = stats.loc[stats['carID'] == car][property_].tolist()[0]
-    return property_of_car
-
-
-def dump_xml_to_df(root):
-    df_total = pd.DataFrame(columns=['time', 'carID', 'edgeID', 'laneID', 'pos', 'speed'])
-    for time in root:
-        for child in time:
-            for child2 in child:
-
-                for child3 in child2:
-                    dictSeries = {'time': str(time.attrib['time']),
-                                  'carID': str(child3.attrib['id']),
-                                  'edgeID': str(child.attrib['id']),
-                                  'laneID': str(child2.attrib['id']),
-                                  'pos': str(child3.attrib['pos']),
-                                  'speed': str(child3.attrib['speed'])}
-                    temporary_df = pd.DataFrame([dictSeries])
-                    df_total = pd.concat([df_total, temporary_df], ignore_index=True, keys=['time', 'carID'])
-    # df_total = df_total.sort_values(['time', 'carID']).reset_index(drop=True)
-    return df_total
-
-
-def dump_edges_xml_to_df(root):
-    df_total = pd.DataFrame()
-    # df_total = pd.DataFrame(
-    #     columns=['id', 'sampledSeconds', 'traveltime', 'overlapTraveltime', 'density', 'laneDensity',
-    #              'occupancy', 'waitingTime', 'timeLoss', 'speed', 'speedRelative', 'departed',
-    #              'arrived', 'entered', 'left', 'laneChangedFrom', 'laneChangedTo'])
-    dictSeries = {}
-    for interval in root:
-        for edge in interval:
-            for ele in edge.attrib.keys():
-                dictSeries[str(ele)] = edge.attrib[str(ele)]
-            # dictSeries = {'id': edge.attrib['id'],
-            #               'numVehicleOnEdgePerSec': edge.attrib['sampledSeconds'],
-            #               'traveltime': edge.attrib['traveltime'],
-            #               'overlapTraveltime': edge.attrib['overlapTraveltime'],
-            #               'density': edge.attrib['density'],
-            #               'laneDensity': edge.attrib['laneDensity'],
-            #               'occupancy': edge.attrib['occupancy'],
-            #               'waitingTime': edge.attrib['waitingTime'],
-            #               'timeLoss': edge.attrib['timeLoss'],
-            #               'speed': edge.attrib['speed'],
-            #               'speedRelative': edge.attrib['speedRelative'],
-            #               'departed': edge.attrib['departed'],
-            #               'arrived': edge.attrib['arrived'],
-            #               'entered': edge.attrib['entered'],
-            #               'left': edge.attrib['left'],
-            #               'laneChangedFrom': edge.attrib['laneChangedFrom'],
-            #               'laneChangedTo': edge.attrib['laneChangedTo']}
-            temporary_df = pd.DataFrame([dictSeries])
-            df_total = pd.concat([df_total, temporary_df], ignore_index=True)
-    return df_total
-
-
-def tripinfo_xml_to_df(root):
-    df_total = pd.DataFrame(
-        columns=['carID', 'depart', 'departLane', 'departPos', 'departSpeed', 'departDelay', 'arrival', 'arrivalLane',
-                 'arrivalPos', 'arrivalSpeed', 'duration', 'routeLength', 'waitingTime', 'rerouteNo', 'speedFactor',
-                 'vaporized'])
-    for tripinfo in root:
-        dictSeries = {'carID': tripinfo.attrib['id'],
-                      'depart': tripinfo.attrib['depart'],
-                      'departLane': tripinfo.attrib['departLane'],
-                      'departPos': tripinfo.attrib['departPos'],
-                      'departSpeed': tripinfo.attrib['departSpeed'],
-                      'departDelay': tripinfo.attrib['departDelay'],
-                      'arrival': tripinfo.attrib['arrival'],
-                      'arrivalLane': tripinfo.attrib['arrivalLane'],
-                      'arrivalPos': tripinfo.attrib['arrivalPos'],
-                      'arrivalSpeed': tripinfo.attrib['arrivalSpeed'],
-                      'duration': tripinfo.attrib['duration'],
-                      'routeLength': tripinfo.attrib['routeLength'],
-                      'waitingTime': tripinfo.attrib['waitingTime'],
-                      'rerouteNo': tripinfo.attrib['rerouteNo'],
-                      'speedFactor': tripinfo.attrib['speedFactor'],
-                      'vaporized': tripinfo.attrib['vaporized']}
-        temp_df = pd.DataFrame([dictSeries])
-        df_total = pd.concat([df_total, temp_df], ignore_index=False)
-
-    # df_total = df_total.sort_values(['carID']).reset_index(drop=True)
-    return df_total
-
-
-# noinspection SpellCheckingInspection
-def generate_routefile():
-    # Create a temporary dictionary to store the carID and onRouteAtStart
-    assigned_routes = {"car0": "route0", "car1": "route0", "car2": "route0", "car3": "route0",
-                       "car4": "route0", "car5": "route0", "car6": "route0", "car7": "route0",
-                       "car8": "route0", "car9": "route0"}
-
-    with open("straight.rou.xml", "w") as routes:
-        print("""<?xml version="1.0" encoding="UTF-8"?>
-        <!-- generated via generate_routefile() in run.py -->
-        <routes>
-            <vType id="passenger1" accel="0.8" decel="4.5" sigma="0.5" length="5" minGap="2.5" maxSpeed="33.33" guiShape="passenger"/>
-            <route id="route0" edges="E0 E12 E4 E7"/>
-            <route id="route1" edges="-E7 -E4 -E12 -E0"/>
-            <route id="route2" edges="-E6 -E12 E2"/>
-            <vehicle id="car0" type="passenger1" route="route0" departPos="0.00"  depart="0"/>
-            <vehicle id="car1" type="passenger1" route="route0" departPos="0.00"  depart="0"/>
-            <vehicle id="car2" type="passenger1" route="route0" departPos="0.00"  depart="0"/>
-            <vehicle id="car3" type="passenger1" route="route0" departPos="0.00"  depart="0"/>
-            <vehicle id="car4" type="passenger1" route="route0" departPos="0.00"  depart="0"/>
-            <vehicle id="car5" type="passenger1" route="route0" departPos="0.00"  depart="0"/>
-            <vehicle id="car6" type="passenger1" route="route0" departPos="0.00"  depart="0"/>
-            <vehicle id="car7" type="passenger1" route="route0" departPos="0.00"  depart="0"/>
-            <vehicle id="car8" type="passenger1" route="route0" departPos="0.00"  depart="0"/>
-            <vehicle id="car9" type="passenger1" route="route0" departPos="0.00"  depart="0"/>
-        </routes>
-""", file=routes)
-    return assigned_routes
-
-
-def update_routefile(df_stats_last_time):
-    # Create a temporary dictionary to store the carID and onRouteAtStart
-    assigned_routes = {}
-
-    with open("straight.rou.xml", "w") as update_routes:
-        print(f"""<?xml version="1.0" encoding="UTF-8"?>
-        <!-- generated via update_routefile() in run.py -->
-        <routes>
-            <vType id="passenger1" accel="0.8" decel="4.5" sigma="0.5" length="5" minGap="2.5" """ 
-              f"""maxSpeed="33.33" guiShape="passenger"/>
-         """, file=update_routes)
-        for key, value in routes.items():
-            print(f"""
-            <route id="{key}" edges="{concat_list_elements(value)}"/>""", file=update_routes)
-        for i in range(10):
-            # "car{i}" in the list of 'carIDs_from_previous_simulation'
-            if 'car{}'.format(i) in carIDs_from_previous_simulation:
-                # Assign selected route to the car:
-                assigned_routes[f'car{i}'] = df_stats_last_time.loc[df_stats_last_time['carID'] == f'car{i}',
-                                                                    'onRouteAtStart'].iloc[0]
-                # print(f"Assigned {assigned_routes}")
-                pos_is_ = get_property("car{}".format(i), 'pos', df_stats_last_time)
-                speed_is_ = get_property("car{}".format(i), 'speed', df_stats_last_time)
-                edge_is_ = get_order_in_datalist(routes[assigned_routes[f'car{i}']],
-                                                 get_property(f"car{i}", 'edgeID', df_stats_last_time))
-                lane_is_ = get_property(f"car{i}", 'laneID', df_stats_last_time)
-
-                print(f"""
-                <vehicle id="car{i}" type="passenger1" route="{assigned_routes[f'car{i}']}" """
-                      f"""depart="0" departLane="{lane_is_.split('_')[-1]}" departEdge="{edge_is_}" """
-                      f"""departPos="{pos_is_}" departSpeed="{speed_is_}"/>""", file=update_routes)
-                del edge_is_, lane_is_, pos_is_, speed_is_
-            else:
-                selected = random_route(routes)
-                assigned_routes[f'car{i}'] = selected[0]
-                print(f"""
-                <vehicle id="car{i}" type="passenger1" route="{assigned_routes[f'car{i}']}" """ 
-                      f"""departPos="0.00"  depart="0"/>""", file=update_routes)
-        print("""
-        </routes>""", file=update_routes)
-    return assigned_routes
+from mobility.events import EventEngine, load_events
+from mobility.phases import PhaseTimer, write_phase_record
+from mobility.stepping import Stepper, write_metrics
+from mobility import checkpoint, fleet, reports
+# pandas, pyarrow and the parsers are only needed once the simulation has ended, they are
+# imported there so that a round reaches its first simulation step as early as possible
+
+
+def generate_routefile(write_routefile=True):
+    vehicles = fleet.first_round_vehicles(library=library, demand=demand)
+    if write_routefile:
+        fleet.write_routefile("straight.rou.xml", routes, vehicles, "generate_routefile()", vtypes=vtypes)
+    return vehicles
+
+
+def update_routefile(continuing, carIDs, write_routefile=True, vtypes_of_cars=None):
+    vehicles = fleet.next_round_vehicles(continuing, carIDs, routes, library=library, demand=demand,
+                                         vtypes=vtypes_of_cars)
+    if write_routefile:
+        fleet.write_routefile("straight.rou.xml", routes, vehicles, "update_routefile()", vtypes=vtypes)
+    return vehicles
 
 
 def generate_netfile():
@@ -225,31 +54,108 @@ def generate_netfile():
         print("""<?xml version="1.0" encoding="UTF-8"?>""", file=nets)
 
 
-def run():
+def run(steps=101, step_delay=0.0, metrics_file=None, listeners=()):
     """execute the TraCI control loop"""
-    step = 0
-    while step < 101:
-        traci.simulationStep()
-        step += 1
-        time.sleep(0.05)
-        # print(sumolib.statistics.round(1.5))
-        # s = sumolib.statistics.Statistics(10)
-        # print(s.toString())
+    stepper = Stepper(step_delay)
+    for listener in listeners:
+        stepper.add_listener(listener)
+    stepper.run(steps)
     traci.close()
+    metrics = stepper.metrics()
+    if metrics_file:
+        write_metrics(metrics, metrics_file)
+    print(f"Steps/sec: {metrics['steps_per_sec']:.1f} (p50 {metrics['step_p50_ms']:.2f} ms, "
+          f"p99 {metrics['step_p99_ms']:.2f} ms per step)")
     sys.stdout.flush()
+    return metrics
 
 
 def get_options():
     optParser = optparse.OptionParser()
     optParser.add_option("--nogui", action="store_true",
                          default=False, help="run the commandline version of sumo")
+    optParser.add_option("--server", action="store_true", default=False,
+                         help="keep sumo running and advance one game round per request (see mobility/server.py)")
+    optParser.add_option("--port", type="int", default=None,
+                         help="serve round requests on this local TCP port instead of stdin")
+    optParser.add_option("--steps", type="int", default=101,
+                         help="number of simulation steps in one game round")
+    optParser.add_option("--step-delay", type="float", default=None,
+                         help="minimum wall-clock seconds per simulation step "
+                              "(default: 0.05 with sumo-gui, 0 i.e. as fast as possible with --nogui)")
+    optParser.add_option("--metrics-file", default="dump/step_metrics.json",
+                         help="file the step timing metrics of a round are written to")
+    optParser.add_option("--inject", action="store_true", default=False,
+                         help="add the vehicles through TraCI instead of loading them from straight.rou.xml")
+    optParser.add_option("--write-routefile", action="store_true", default=False,
+                         help="with --inject, still write straight.rou.xml as a record of the round")
+    optParser.add_option("--collect-state", action="store_true", default=False,
+                         help="record the vehicle states through TraCI subscriptions instead of the netstate dump")
+    optParser.add_option("--sample-interval", type="int", default=1,
+                         help="with --collect-state, record the vehicle states every N steps (the last step always)")
+    optParser.add_option("--final-state-only", action="store_true", default=False,
+                         help="with --collect-state, keep only the vehicle states of the last step")
+    optParser.add_option("--phases-file", default="dump/round_phases.json",
+                         help="file the time and memory of every phase of a round are written to "
+                              "(all rounds are appended to round_phases.csv in the store)")
+    optParser.add_option("--trace-memory", action="store_true", default=False,
+                         help="also record the peak Python memory of every phase with tracemalloc (slower)")
+    optParser.add_option("--profile", default=None,
+                         help="write a cProfile dump of the round to this file (see python -m pstats)")
+    optParser.add_option("--store", default="store",
+                         help="directory of the Parquet files with the results of every round")
+    optParser.add_option("--csv", action="store_true", default=False,
+                         help="also write the results of the round to csv/ and csv/history/")
+    optParser.add_option("--checkpoint", default=checkpoint.CHECKPOINT_FILE,
+                         help="file with the end-of-round state the next round continues from")
+    optParser.add_option("--route-library", action="store_true", default=False,
+                         help="draw the routes from all origin/destination routes of straight.net.xml "
+                              "instead of the three fixed routes")
+    optParser.add_option("--route-endpoints", default=None,
+                         help="comma separated edges the route library routes between, "
+                              "instead of the edges at the fringe of the net")
+    optParser.add_option("--demand", default=None,
+                         help="JSON file with the fleet size, vType mix and departure distributions "
+                              "(see DEMAND in mobility/fleet.py)")
+    optParser.add_option("--fleet-size", type="int", default=None,
+                         help="number of vehicles of a generated fleet (overrides the size in --demand)")
+    optParser.add_option("--events", default=None,
+                         help="JSON file with a timeline of road events applied during the round (see mobility/events.py)")
+    optParser.add_option("--reports", type="choice", choices=["background", "sync", "off"], default="background",
+                         help="render the PNG reports in stats/ in a detached process (background), before the "
+                              "round ends (sync) or not at all (off, render later with scripts/render_reports.py)")
+    optParser.add_option("--live-feed", default=None,
+                         help="publish the live edge and vehicle states to this memory-mapped file, "
+                              "e.g. dump/live.feed or /dev/shm/live.feed (see mobility/livefeed.py)")
+    optParser.add_option("--live-interval", type="int", default=1,
+                         help="publish a frame of the live feed every N steps")
+    optParser.add_option("--live-max-vehicles", type="int", default=None,
+                         help="vehicles per frame of the live feed (default: the fleet size)")
     options, args = optParser.parse_args()
     return options
 
 
+def live_feed(steps=None):
+    # Edge table of the net and one frame slot per vehicle of the fleet, or of --live-max-vehicles;
+    # carIDs of at least 16 bytes, so the layout stays the same while the carIDs of a fleet grow
+    from mobility.livefeed import FeedWriter, LiveFeed, net_edges
+    edge_ids, edge_lengths = net_edges("straight.net.xml")
+    vehicle_id_width = max([16] + [len(vehicle.carID.encode()) for vehicle in vehicles])
+    writer = FeedWriter(options.live_feed, edge_ids, edge_lengths, options.live_max_vehicles or len(vehicles),
+                        has_run=HasRun, vehicle_id_width=vehicle_id_width)
+    return LiveFeed(writer, steps, options.live_interval)
+
+
 # this is the main entry point of this script
 if __name__ == "__main__":
     options = get_options()
+    if options.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    phases = PhaseTimer(options.trace_memory)
+    # In server mode stdout carries the answers to the requests, so the messages of the round go to stderr
+    log = sys.stderr if options.server else sys.stdout
 
     # this script has been called from the command line. It will start sumo as a
     # server, then connect and run
@@ -257,99 +163,191 @@ if __name__ == "__main__":
         sumoBinary = checkBinary('sumo')
     else:
         sumoBinary = checkBinary('sumo-gui')
+    # Follow the vehicles in the gui at a watchable pace, run headless rounds unthrottled
+    if options.step_delay is None:
+        options.step_delay = 0.0 if options.nogui else 0.05
     # Define variables
-    routes = {'route0': ['E0', 'E12', 'E4', 'E7'],
-              'route1': ['-E7', '-E4', '-E12', '-E0'],
-              'route2': ['-E6', '-E12', 'E2']}
+    phases.start('setup')
+    if options.route_library:
+        # Fastest routes between all origins and destinations of the net, cached until the net changes
+        from mobility.routing import load_route_library
+        endpoints = options.route_endpoints.split(',') if options.route_endpoints else None
+        library = load_route_library("straight.net.xml", endpoints=endpoints)
+        routes = library.routes
+    else:
+        library = None
+        routes = fleet.ROUTES
+    # A generated fleet of any size with a mix of vTypes and spread departures, or the ten cars of the game
+    if options.demand or options.fleet_size:
+        demand = fleet.load_demand(options.demand, options.fleet_size)
+        vtypes = fleet.demand_vtypes(demand)
+        if library is None:
+            from mobility.routing import fixed_route_library
+            library = fixed_route_library(routes, "straight.net.xml")
+    else:
+        demand = vtypes = None
 
+    # With --inject the vehicles are added through TraCI, so the route file is only an optional record
+    write_routefile = not options.inject or options.write_routefile
     # Generate or update the route file for the simulation
-    if not os.path.exists("dump/tripinfo.xml") or not os.path.exists("csv/simulationStats.csv"):
+    phases.start('routefile')
+    previous_round = checkpoint.load_previous_round(routes, options.checkpoint, options.store)
+    if previous_round is None:
         first_round = True
-        assigned_routes = generate_routefile()
+        vehicles = generate_routefile(write_routefile)
         HasRun = 1
-        print("First round of simulation")
+        print("First round of simulation", file=log)
         # generate_netfile()
     else:
         first_round = False
-        # Import data from the csv file and store it in a dataframe named df_stats
-        df_stats = pd.read_csv('csv/simulationStats.csv', dtype=str, keep_default_na=False)
-        #print(df_stats.head(20))
-        print("Further round of simulation")
-
-        # filter for the last time step
-        df_stats_last_time = df_stats.loc[df_stats['time'] == df_stats['time'].tail(1).tolist()[0]]
-        HasRun = int(df_stats_last_time['HasRun'].tolist()[0]) + 1
+        print("Further round of simulation", file=log)
+        HasRun = previous_round['HasRun'] + 1
+        if previous_round['rng_state'] is not None:
+            # Continue the random route choices where the previous round stopped
+            random.setstate(previous_round['rng_state'])
         # List of vehicle IDs that did not complete their route in the previous simulation step
-        carIDs_from_previous_simulation = df_stats_last_time['carID'].tolist()
-        print("Cars from previous simulation:", carIDs_from_previous_simulation)
-        assigned_routes = update_routefile(df_stats_last_time)
-    print("Assigned Routes:", assigned_routes)
+        carIDs_from_previous_simulation = [vehicle.carID for vehicle in previous_round['vehicles']]
+        if len(carIDs_from_previous_simulation) <= 100:
+            print("Cars from previous simulation:", carIDs_from_previous_simulation, file=log)
+        else:
+            print("Cars from previous simulation:", len(carIDs_from_previous_simulation), file=log)
+        carIDs_in_fleet = fleet.fleet_carIDs(previous_round['fleet'], demand)
+        vtypes_of_cars = dict(zip(previous_round['fleet'], previous_round['vtypes'] or []))
+        vehicles = update_routefile(previous_round['vehicles'], carIDs_in_fleet, write_routefile, vtypes_of_cars)
+    assigned_routes = fleet.assigned_routes(vehicles)
+    # A large generated fleet is only counted
+    print("Assigned Routes:", assigned_routes if len(assigned_routes) <= 100 else f"{len(assigned_routes)} vehicles",
+          file=log)
 
     # If directory 'dump' does not exist, create it
     if not os.path.exists("dump"):
         os.makedirs("dump")
+    sumoCmd = [sumoBinary, "-c", "straight.sumocfg",
+               "--tripinfo-output", "dump/tripinfo.xml", "--tripinfo-output.write-unfinished", "True",
+               "--start", "--quit-on-end"]
+    if options.inject:
+        # Do not load the route file named in straight.sumocfg, the vehicles come through TraCI
+        sumoCmd += ["--route-files", ""]
+    if options.server:
+        # Keep one sumo session alive and advance it by one game round per request,
+        # so the vehicles keep their exact state between rounds
+        from mobility.server import RoundServer, serve
+        round_server = RoundServer(routes, HasRun, options.steps, Stepper(options.step_delay),
+                                   options.metrics_file, vtypes=vtypes,
+                                   vtypes_of_cars={vehicle.carID: vehicle.vtype for vehicle in vehicles},
+                                   library=library)
+        round_server.start(sumoCmd)
+        if options.inject:
+            round_server.stepper.add_listener(fleet.inject_vehicles(routes, vehicles, vtypes=vtypes))
+        if options.events:
+            round_server.stepper.add_listener(EventEngine(load_events(options.events)))
+        if options.live_feed:
+            round_server.stepper.add_listener(live_feed())
+        serve(round_server, options.port)
+        sys.exit(0)
+
     # this is the normal way of using traci. sumo is started as a
     # subprocess and then the python script connects and runs
-    traci.start([sumoBinary, "-c", "straight.sumocfg",
-                 "--tripinfo-output", "dump/tripinfo.xml", "--tripinfo-output.write-unfinished", "True",
-                 "--start", "--quit-on-end", "--netstate-dump", "dump/dump.xml"])
-    run()
+    sumoCmd += ["--end", str(options.steps)]
+    if not options.collect_state:
+        sumoCmd += ["--netstate-dump", "dump/dump.xml"]
+    phases.start('traci_start')
+    traci.start(sumoCmd)
+    listeners = []
+    if options.inject:
+        phases.start('inject')
+        listeners.append(fleet.inject_vehicles(routes, vehicles, vtypes=vtypes))
+    if options.events:
+        listeners.append(EventEngine(load_events(options.events)))
+    if options.collect_state:
+        from mobility.collector import StateCollector
+        collector = StateCollector(options.steps, options.sample_interval, options.final_state_only,
+                                   expected_vehicles=len(vehicles))
+        listeners.append(collector)
+    if options.live_feed:
+        listeners.append(live_feed(options.steps))
+    phases.start('simulation')
+    run(options.steps, options.step_delay, options.metrics_file, listeners)
 
     # Update the simulation results after the simulation has ended
-    dump_root = parse_xml('dump/dump.xml')
-    df_dump_xml = dump_xml_to_df(dump_root)
-
-    tripinfo_root = parse_xml('dump/tripinfo.xml')
-    df_tripinfo_xml = tripinfo_xml_to_df(tripinfo_root)
-
-    df_stats = pd.merge(df_dump_xml, df_tripinfo_xml, on='carID', how='left')
-    df_stats = df_stats[['time', 'carID', 'depart', 'edgeID',
-                         'departLane', 'laneID', 'arrivalLane',
-                         'departPos', 'pos', 'arrivalPos',
-                         'departSpeed', 'speed', 'arrivalSpeed',
-                         'departDelay', 'waitingTime', 'duration', 'arrival',
-                         'routeLength', 'rerouteNo', 'speedFactor', 'vaporized']]
-
-    # Add a new column to dataframe which counts how many times the simulation has been restarted
-    df_stats['HasRun'] = HasRun
+    phases.start('imports')
+    import pandas as pd
+    from mobility.parsers import DUMP_COLUMNS, dump_xml_to_df, dump_edges_xml_to_df, tripinfo_xml_to_df, last_states
+    from mobility import aggregates, storage
+    phases.start('parse_dump')
+    if options.collect_state:
+        df_dump_xml = collector.to_dataframe()[DUMP_COLUMNS]
+    else:
+        df_dump_xml = dump_xml_to_df('dump/dump.xml')
+
+    phases.start('parse_tripinfo')
+    df_tripinfo_xml = tripinfo_xml_to_df('dump/tripinfo.xml')
+
+    # The vehicle states and the trips are kept apart, one row per car and step and one row per car;
+    # simulationStats, their join over the whole timeline, is only built on demand and in chunks
+    phases.start('trips')
     print("Running Time:", HasRun)
 
-    # Add a new column to dataframe which records the routes assigned to each vehicle
-    df_stats['onRouteAtStart'] = df_stats['carID'].map(assigned_routes)
+    # Add a new column to the trips which records the routes assigned to each vehicle
+    df_tripinfo_xml['onRouteAtStart'] = df_tripinfo_xml['carID'].astype(str).map(assigned_routes)
 
     # Calculate based on Edge Statistics
-    dump_edge = parse_xml('dump/dump_edges.xml')
-    df_dump_edges_xml = dump_edges_xml_to_df(dump_edge)
-
-    dump_edge_co2 = parse_xml('dump/dump_edges_co2.xml')
-    df_dump_edges_co2_xml = dump_edges_xml_to_df(dump_edge_co2)
-
-    # If directory 'csv' does not exist, create it
-    if not os.path.exists("csv"):
-        os.makedirs("csv")
-    pd.DataFrame.to_csv(df_stats, 'csv/simulationStats.csv', index=False, quoting=csv.QUOTE_ALL)
-    pd.DataFrame.to_csv(df_dump_xml, 'csv/dump.csv', index=False, quoting=csv.QUOTE_ALL)
-    pd.DataFrame.to_csv(df_tripinfo_xml, 'csv/tripinfo.csv', index=False, quoting=csv.QUOTE_ALL)
-    pd.DataFrame.to_csv(df_dump_edges_xml, 'csv/dump_edges.csv', index=False, quoting=csv.QUOTE_ALL)
-    pd.DataFrame.to_csv(df_dump_edges_co2_xml, 'csv/dump_edges_co2.csv', index=False, quoting=csv.QUOTE_ALL)
-
-    # Copy 'csv/simulationStats.csv' file to 'csv/history/simulationStats_<HasRun>.csv
-    if not os.path.exists("csv/history"):
-        os.makedirs("csv/history")
-    shutil.copy('csv/simulationStats.csv', 'csv/history/0' + str(HasRun) + '_simulationStats.csv')
-    shutil.copy('csv/dump.csv', 'csv/history/0' + str(HasRun) + '_dump.csv')
-    shutil.copy('csv/tripinfo.csv', 'csv/history/0' + str(HasRun) + '_tripinfo.csv')
-    shutil.copy('csv/dump_edges.csv', 'csv/history/0' + str(HasRun) + '_dump_edges.csv')
-    shutil.copy('csv/dump_edges_co2.csv', 'csv/history/0' + str(HasRun) + '_dump_edges_co2.csv')
-
-    # If directory 'stats' does not exist, create it
-    if not os.path.exists('stats'):
-        os.makedirs('stats')
-    dfi.export(df_dump_xml, f'stats/0{HasRun}_df_dump_xml.png', max_rows=30)
-    dfi.export(df_dump_edges_xml, f'stats/0{HasRun}_df_dump_edges_xml.png', max_rows=30)
-    dfi.export(df_dump_edges_co2_xml, f'stats/0{HasRun}_df_dump_edges_co2_xml.png', max_rows=30)
-    dfi.export(df_tripinfo_xml, f'stats/0{HasRun}_df_tripinfo_xml.png', max_rows=30)
-    dfi.export(df_stats, f'stats/0{HasRun}_df_stats.png', max_rows=30)
+    phases.start('parse_edges')
+    df_dump_edges_xml = dump_edges_xml_to_df('dump/dump_edges.xml')
+    df_dump_edges_co2_xml = dump_edges_xml_to_df('dump/dump_edges_co2.xml')
+
+    # Every table is written once into the round's partition of the store, csv files only on request
+    tables = {'dump': df_dump_xml, 'tripinfo': df_tripinfo_xml,
+              'dump_edges': df_dump_edges_xml, 'dump_edges_co2': df_dump_edges_co2_xml}
+    phases.start('store')
+    store = storage.RoundStore(options.store)
+    store.write_round(tables, HasRun)
+    if options.csv:
+        phases.start('csv')
+        storage.export_csv(tables, HasRun)
+
+    # Running statistics of the edge metrics over all rounds, updated with this round only
+    phases.start('aggregates')
+    edge_aggregates = aggregates.EdgeAggregates(os.path.join(options.store, 'edge_aggregates.parquet'))
+    if not edge_aggregates.exists() and HasRun > 1:
+        # Rounds stored before the aggregates existed are added once, this round included
+        edge_aggregates.rebuild(store)
+    elif not edge_aggregates.update(tables, HasRun):
+        # This round was run before, e.g. when the previous run ended before its checkpoint, and has
+        # just replaced the stored one, so the aggregates are built again from the store
+        print(f"Round {HasRun} is already in the edge aggregates, rebuilding them from the store")
+        edge_aggregates.rebuild(store)
+
+    # The checkpoint is replaced last, so an interrupted round is simply run again next time
+    phases.start('checkpoint')
+    df_stats_last_time = last_states(df_dump_xml, df_tripinfo_xml)
+    # The fleet is every planned car, also the ones which had not departed yet when the round ended
+    carIDs_in_fleet = pd.unique(pd.concat([pd.Series([vehicle.carID for vehicle in vehicles], dtype=str),
+                                           df_dump_xml['carID'].astype(str), df_tripinfo_xml['carID'].astype(str)])).tolist()
+    if demand is not None:
+        vtype_of_car = {vehicle.carID: vehicle.vtype for vehicle in vehicles}
+        vtypes_of_fleet = [vtype_of_car.get(car) for car in carIDs_in_fleet]
+    else:
+        vtypes_of_fleet = None
+    checkpoint.write_checkpoint(checkpoint.make_checkpoint(HasRun, fleet.continuing_vehicles(df_stats_last_time, routes),
+                                                           carIDs_in_fleet, random.getstate(), vtypes_of_fleet),
+                                options.checkpoint)
+
+    # The PNG reports in stats/ are rendered from the store, by default while the next round already runs
+    phases.start('reports')
+    if options.reports == 'background':
+        reports.render_in_background(options.store, HasRun)
+    elif options.reports == 'sync':
+        reports.render_round(dict(tables, simulationStats=reports.stats_preview(df_dump_xml, df_tripinfo_xml, HasRun)),
+                             HasRun)
+
+    # Time and memory of every phase of the round, and their history over all rounds
+    write_phase_record(phases.record(HasRun, vehicles=len(vehicles), steps=options.steps), options.phases_file,
+                       os.path.join(options.store, 'round_phases.csv'))
+    if options.profile:
+        profiler.disable()
+        profiler.dump_stats(options.profile)
+        print("Profile written to", options.profile)
 
     print("Simulation ended !!")
 
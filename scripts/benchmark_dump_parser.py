@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+
+# @author    Muzaffer Citir
+# @date      2026.10.18
+# @location  Berlin, Germany
+# @version   1.0
+
+# @brief   Benchmark of the streaming netstate dump parser against the former row-by-row version.
+# Path: scripts/benchmark_dump_parser.py
+import os
+import sys
+import optparse
+import shutil
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from mobility import parsers, synthetic  # noqa
+
+
+def legacy_dump_xml_to_df(xml_file):
+    # dump_xml_to_df() as it was in run.py before the streaming parser. The unused `keys`
+    # argument of pd.concat is left out, since newer pandas versions reject it
+    root = ET.parse(xml_file).getroot()
+    df_total = pd.DataFrame(columns=['time', 'carID', 'edgeID', 'laneID', 'pos', 'speed'])
+    for time_ in root:
+        for child in time_:
+            for child2 in child:
+                for child3 in child2:
+                    dictSeries = {'time': str(time_.attrib['time']),
+                                  'carID': str(child3.attrib['id']),
+                                  'edgeID': str(child.attrib['id']),
+                                  'laneID': str(child2.attrib['id']),
+                                  'pos': str(child3.attrib['pos']),
+                                  'speed': str(child3.attrib['speed'])}
+                    temporary_df = pd.DataFrame([dictSeries])
+                    df_total = pd.concat([df_total, temporary_df], ignore_index=True)
+    return df_total
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def get_options():
+    optParser = optparse.OptionParser()
+    optParser.add_option("--sizes", default="10000,100000,1000000,10000000",
+                         help="comma separated numbers of vehicle-steps to benchmark")
+    optParser.add_option("--vehicles", type="int", default=1000,
+                         help="vehicles per timestep in the synthetic dump")
+    optParser.add_option("--legacy-max", type="int", default=10000,
+                         help="largest size on which the former quadratic parser is also run")
+    options, args = optParser.parse_args()
+    return options
+
+
+if __name__ == "__main__":
+    options = get_options()
+    workdir = tempfile.mkdtemp(prefix='dump_benchmark_')
+    try:
+        print(f"{'vehicle-steps':>14} {'MB':>8} {'streaming s':>12} {'legacy s':>10} {'speed-up':>9}")
+        for size in [int(s) for s in options.sizes.split(',')]:
+            vehicles = min(options.vehicles, size)
+            steps = max(1, size // vehicles)
+            xml_file = os.path.join(workdir, f'dump_{size}.xml')
+            synthetic.write_dump(xml_file, vehicles, steps)
+            megabytes = os.path.getsize(xml_file) / 1e6
+
+            df_new, new_seconds = timed(parsers.dump_xml_to_df, xml_file)
+            if size <= options.legacy_max:
+                df_old, old_seconds = timed(legacy_dump_xml_to_df, xml_file)
+                # Both parsers have to agree on every row before the timings mean anything
+                assert list(df_new.columns) == list(df_old.columns)
+                assert len(df_new) == len(df_old)
+                assert (df_new['carID'].astype(str).values == df_old['carID'].values).all()
+                assert (df_new['pos'].values == df_old['pos'].astype(float).values).all()
+                legacy = f"{old_seconds:10.3f} {old_seconds / new_seconds:8.1f}x"
+            else:
+                legacy = f"{'-':>10} {'-':>9}"
+            print(f"{len(df_new):14d} {megabytes:8.1f} {new_seconds:12.3f} {legacy}")
+            os.remove(xml_file)
+    finally:
+        shutil.rmtree(workdir)
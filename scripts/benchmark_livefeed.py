@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+
+# @author    Muzaffer Citir
+# @date      2026.10.18
+# @location  Berlin, Germany
+# @version   1.0
+
+# @brief   Benchmark of the live feed on synthetic vehicle states, without SUMO.
+# Path: scripts/benchmark_livefeed.py
+#
+# For every fleet size, subscription results as TraCI returns them are built for all vehicles and
+# published as --frames frames into a feed file, then read back as the game client would. Writing
+# the same states as one CSV text file per frame is timed as the baseline.
+import os
+import sys
+import csv
+import optparse
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import traci.constants as tc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from mobility import synthetic  # noqa
+from mobility.livefeed import FeedReader, FeedWriter, LiveFeed  # noqa
+
+
+def subscription_results(vehicles, edge_ids, seed=42):
+    # What traci.vehicle.getAllSubscriptionResults() returns for the vehicles of the feed
+    generator = np.random.default_rng(seed)
+    edges = generator.integers(0, len(edge_ids), vehicles).tolist()
+    values = generator.random((vehicles, 5)).tolist()
+    return {f'car{car}': {tc.VAR_ROAD_ID: edge_ids[edge], tc.VAR_LANE_ID: f'{edge_ids[edge]}_0',
+                          tc.VAR_LANEPOSITION: value[0] * 100, tc.VAR_SPEED: value[1] * 15,
+                          tc.VAR_ROUTE_ID: 'route0', tc.VAR_POSITION: (value[2] * 1000, value[3] * 1000),
+                          tc.VAR_ANGLE: value[4] * 360, tc.VAR_CO2EMISSION: value[1] * 4000}
+            for car, (edge, value) in enumerate(zip(edges, values))}
+
+
+def write_csv_frame(csv_file, results):
+    # The baseline: one text file per frame, which the client would have to poll and parse
+    with open(csv_file, 'w', newline='') as output:
+        writer = csv.writer(output)
+        writer.writerow(['carID', 'edgeID', 'x', 'y', 'speed', 'angle', 'co2'])
+        for car, values in results.items():
+            x, y = values[tc.VAR_POSITION]
+            writer.writerow([car, values[tc.VAR_ROAD_ID], f'{x:.2f}', f'{y:.2f}', f'{values[tc.VAR_SPEED]:.2f}',
+                             f'{values[tc.VAR_ANGLE]:.2f}', f'{values[tc.VAR_CO2EMISSION]:.2f}'])
+
+
+def benchmark_fleet(vehicles, edges, frames, workdir):
+    edge_ids = synthetic.make_edges(edges)
+    results = subscription_results(vehicles, edge_ids)
+    feed_file = os.path.join(workdir, 'live.feed')
+    writer = FeedWriter(feed_file, edge_ids, [100.0] * edges, vehicles)
+    feed = LiveFeed(writer, frames)
+    reader = FeedReader(feed_file)
+
+    start = time.perf_counter()
+    for step in range(frames):
+        feed.publish(step, float(step), results)
+    publish_seconds = (time.perf_counter() - start) / frames
+    frame_mb = writer.feed.header['slot_size'] / 1e6
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        frame, edge_states, vehicle_states = reader.read()
+    read_seconds = (time.perf_counter() - start) / frames
+    assert frame['vehicles'] == vehicles and edge_states['vehicles'].sum() == vehicles
+    reader.close()
+    writer.close()
+
+    csv_frames = max(1, frames // 10)
+    start = time.perf_counter()
+    for step in range(csv_frames):
+        write_csv_frame(os.path.join(workdir, 'live.csv'), results)
+    csv_seconds = (time.perf_counter() - start) / csv_frames
+    return {'vehicles': vehicles, 'edges': edges, 'frame_mb': frame_mb, 'publish_ms': publish_seconds * 1000,
+            'vehicles_per_sec': vehicles / publish_seconds, 'read_ms': read_seconds * 1000,
+            'csv_ms': csv_seconds * 1000}
+
+
+def get_options():
+    optParser = optparse.OptionParser()
+    optParser.add_option("--vehicles", default="1000,5000,10000",
+                         help="comma separated fleet sizes")
+    optParser.add_option("--edges", type="int", default=1000,
+                         help="edges of the synthetic net")
+    optParser.add_option("--frames", type="int", default=100,
+                         help="frames published per fleet size")
+    options, args = optParser.parse_args()
+    return options
+
+
+if __name__ == "__main__":
+    options = get_options()
+    workdir = tempfile.mkdtemp(prefix='livefeed_benchmark_')
+    try:
+        print(f"{'vehicles':>9} {'edges':>6} {'frame MB':>9} {'publish ms':>11} {'vehicles/sec':>13} "
+              f"{'read ms':>8} {'csv ms':>8}")
+        for vehicles in options.vehicles.split(','):
+            row = benchmark_fleet(int(vehicles), options.edges, options.frames, workdir)
+            print(f"{row['vehicles']:9d} {row['edges']:6d} {row['frame_mb']:9.3f} {row['publish_ms']:11.3f} "
+                  f"{row['vehicles_per_sec']:13.0f} {row['read_ms']:8.3f} {row['csv_ms']:8.3f}")
+    finally:
+        shutil.rmtree(workdir)
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+
+# @author    Muzaffer Citir
+# @date      2026.10.18
+# @location  Berlin, Germany
+# @version   1.0
+
+# @brief   Benchmark of the round pipeline after the simulation on synthetic SUMO outputs, without SUMO.
+# Path: scripts/benchmark_pipeline.py
+#
+# For every scale (vehicles x steps x edges) synthetic dump.xml, tripinfo.xml and edgeData files are
+# written, then the parsers, the chunked join into simulationStats and the restore of the next round
+# are timed. Every stage is run --repeat times for the fastest time and once more under tracemalloc for
+# its peak memory. One row per scale and stage is appended to the results file, so runs on
+# different commits can be compared.
+import os
+import sys
+import csv
+import optparse
+import platform
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from mobility import checkpoint, fleet, parsers, synthetic  # noqa
+
+RESULT_FIELDS = ['date', 'commit', 'python', 'pandas', 'vehicles', 'steps', 'edges', 'stage', 'rows',
+                 'input_mb', 'seconds', 'rows_per_sec', 'mb_per_sec', 'peak_mb']
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                              stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, universal_newlines=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def measure(function, repeat):
+    """(result, fastest seconds of repeat runs, peak MB of one run under tracemalloc)"""
+    seconds = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        seconds = min(seconds, time.perf_counter() - start)
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak / 1e6
+
+
+def join_stats(df_dump, df_trips):
+    # simulationStats as written to csv/simulationStats.csv, one chunk at a time; the number of rows
+    return sum(len(chunk) for chunk in parsers.iter_stats(df_dump, df_trips, 1))
+
+
+def restore(df_dump, df_trips, routes, carIDs, route_file):
+    # What a round does to plan the next one: the cars still driving at the last time step continue,
+    # the others get a new route, and the route file is written
+    df_stats_last_time = parsers.last_states(df_dump, df_trips)
+    continuing = fleet.continuing_vehicles(df_stats_last_time, routes)
+    vehicles = fleet.next_round_vehicles(continuing, carIDs, routes, random.Random(42))
+    fleet.write_routefile(route_file, routes, vehicles, 'scripts/benchmark_pipeline.py')
+    return vehicles
+
+
+def checkpoint_round_trip(vehicles, carIDs, checkpoint_file):
+    continuing = [vehicle for vehicle in vehicles if vehicle.edge is not None]
+    checkpoint.write_checkpoint(checkpoint.make_checkpoint(1, continuing, carIDs, random.getstate()), checkpoint_file)
+    return checkpoint.read_checkpoint(checkpoint_file)['vehicles']
+
+
+def benchmark_scale(vehicles, steps, edges, repeat, workdir):
+    """result rows of all stages at one scale"""
+    edge_ids = synthetic.make_edges(edges)
+    files = {'dump': os.path.join(workdir, 'dump.xml'), 'tripinfo': os.path.join(workdir, 'tripinfo.xml'),
+             'dump_edges': os.path.join(workdir, 'dump_edges.xml'),
+             'dump_edges_co2': os.path.join(workdir, 'dump_edges_co2.xml')}
+    synthetic.write_dump(files['dump'], vehicles, steps, edge_ids)
+    synthetic.write_tripinfo(files['tripinfo'], vehicles, steps, edge_ids)
+    synthetic.write_edge_data(files['dump_edges'], edge_ids)
+    synthetic.write_edge_data(files['dump_edges_co2'], edge_ids, emissions=True)
+    sizes = {name: os.path.getsize(path) / 1e6 for name, path in files.items()}
+    # One route over all edges, so that every car of the synthetic dump is on its route
+    routes = {'route0': edge_ids}
+    carIDs = [f'car{car}' for car in range(vehicles)]
+
+    results = []
+
+    def add(stage, function, input_mb=0.0):
+        result, seconds, peak_mb = measure(function, repeat)
+        rows = result if isinstance(result, int) else len(result)
+        results.append({'vehicles': vehicles, 'steps': steps, 'edges': edges, 'stage': stage, 'rows': rows,
+                        'input_mb': round(input_mb, 3), 'seconds': round(seconds, 6),
+                        'rows_per_sec': round(rows / seconds) if seconds else 0,
+                        'mb_per_sec': round(input_mb / seconds, 3) if seconds else 0,
+                        'peak_mb': round(peak_mb, 3)})
+        return result
+
+    df_dump = add('dump_xml_to_df', lambda: parsers.dump_xml_to_df(files['dump']), sizes['dump'])
+    df_tripinfo = add('tripinfo_xml_to_df', lambda: parsers.tripinfo_xml_to_df(files['tripinfo']), sizes['tripinfo'])
+    add('dump_edges_xml_to_df', lambda: parsers.dump_edges_xml_to_df(files['dump_edges']), sizes['dump_edges'])
+    add('dump_edges_co2_xml_to_df', lambda: parsers.dump_edges_xml_to_df(files['dump_edges_co2']),
+        sizes['dump_edges_co2'])
+    df_tripinfo['onRouteAtStart'] = 'route0'
+    add('join_stats', lambda: join_stats(df_dump, df_tripinfo))
+    next_round = add('restore', lambda: restore(df_dump, df_tripinfo, routes, carIDs,
+                                                os.path.join(workdir, 'straight.rou.xml')))
+    add('checkpoint', lambda: checkpoint_round_trip(next_round, carIDs, os.path.join(workdir, 'checkpoint.json')))
+    for path in files.values():
+        os.remove(path)
+    return results
+
+
+def get_options():
+    optParser = optparse.OptionParser()
+    optParser.add_option("--scales", default="10x101x10,1000x101x100,10000x101x1000",
+                         help="comma separated scales as vehicles x steps x edges")
+    optParser.add_option("--repeat", type="int", default=3,
+                         help="runs of every stage, the fastest one counts")
+    optParser.add_option("--output", default=os.path.join("stats", "benchmark_results.csv"),
+                         help="CSV file the results are appended to")
+    options, args = optParser.parse_args()
+    return options
+
+
+if __name__ == "__main__":
+    options = get_options()
+    common = {'date': time.strftime('%Y-%m-%dT%H:%M:%S'), 'commit': git_commit(),
+              'python': platform.python_version(), 'pandas': pd.__version__}
+    workdir = tempfile.mkdtemp(prefix='pipeline_benchmark_')
+    try:
+        rows = []
+        print(f"{'vehicles x steps x edges':>24} {'stage':>24} {'rows':>10} {'seconds':>9} "
+              f"{'rows/sec':>11} {'MB/sec':>8} {'peak MB':>8}")
+        for scale in options.scales.split(','):
+            vehicles, steps, edges = (int(value) for value in scale.split('x'))
+            for row in benchmark_scale(vehicles, steps, edges, options.repeat, workdir):
+                rows.append(dict(common, **row))
+                print(f"{scale:>24} {row['stage']:>24} {row['rows']:10d} {row['seconds']:9.4f} "
+                      f"{row['rows_per_sec']:11d} {row['mb_per_sec']:8.1f} {row['peak_mb']:8.1f}")
+    finally:
+        shutil.rmtree(workdir)
+
+    directory = os.path.dirname(options.output)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    new_file = not os.path.exists(options.output)
+    with open(options.output, 'a', newline='') as output:
+        writer = csv.DictWriter(output, fieldnames=RESULT_FIELDS)
+        if new_file:
+            writer.writeheader()
+        writer.writerows(rows)
+    print("Results appended to", options.output)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+
+# @author    Muzaffer Citir
+# @date      2026.10.18
+# @location  Berlin, Germany
+# @version   1.0
+
+# @brief   Startup benchmark of run.py: import time per module and cold start up to the first simulation step.
+# Path: scripts/benchmark_startup.py
+#
+# Every game round is a new process, so the imports of run.py are paid every round. The import
+# report comes from `python -X importtime -c "import run"`. The cold start is measured from the
+# launch of `run.py --nogui` to the first traci.simulationStep(), which run.py writes to its step
+# metrics; it needs sumo and is skipped without it.
+import os
+import sys
+import json
+import optparse
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+
+def import_times(python=sys.executable):
+    """[(cumulative us, self us, module)] of `import run`, from -X importtime"""
+    env = dict(os.environ, SUMO_HOME=os.environ.get('SUMO_HOME', ''))
+    result = subprocess.run([python, '-X', 'importtime', '-c', 'import run'], cwd=PROJECT_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    modules = []
+    for line in result.stderr.splitlines():
+        # import time:   self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        modules.append((int(cumulative_us), int(self_us), module.rstrip()))
+    return modules
+
+
+def cold_start(steps, workdir, python=sys.executable):
+    """seconds from the launch of run.py to its first simulation step, and the wall time of the whole round"""
+    metrics_file = os.path.join(workdir, 'step_metrics.json')
+    # The round gets its own store and checkpoint, so the rounds of the game are not touched
+    command = [python, 'run.py', '--nogui', '--inject', '--reports', 'off', '--steps', str(steps),
+               '--store', os.path.join(workdir, 'store'), '--checkpoint', os.path.join(workdir, 'checkpoint.json'),
+               '--metrics-file', metrics_file]
+    launch = time.time()
+    subprocess.run(command, cwd=PROJECT_DIR, stdout=subprocess.DEVNULL, check=True)
+    total = time.time() - launch
+    with open(metrics_file) as metrics_input:
+        metrics = json.load(metrics_input)
+    return metrics['first_step_time'] - launch, total
+
+
+def get_options():
+    optParser = optparse.OptionParser()
+    optParser.add_option("--top", type="int", default=15,
+                         help="number of modules with the largest cumulative import time to show")
+    optParser.add_option("--repeat", type="int", default=5,
+                         help="number of rounds started to measure the cold start")
+    optParser.add_option("--steps", type="int", default=1,
+                         help="simulation steps of every measured round")
+    optParser.add_option("--output", default=None,
+                         help="JSON file the results are written to")
+    options, args = optParser.parse_args()
+    return options
+
+
+if __name__ == "__main__":
+    options = get_options()
+    results = {}
+
+    modules = import_times()
+    # The last line of the report is `run` itself, its cumulative time covers all imports
+    total_us = modules[-1][0] if modules else 0
+    results['import_run_ms'] = total_us / 1000
+    results['import_top'] = [{'module': module.strip(), 'cumulative_ms': cumulative / 1000, 'self_ms': self_ / 1000}
+                             for cumulative, self_, module in sorted(modules, reverse=True)[:options.top]]
+    print(f"import run: {total_us / 1000:.1f} ms")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for cumulative, self_, module in sorted(modules, reverse=True)[:options.top]:
+        print(f"{cumulative / 1000:14.1f} {self_ / 1000:9.1f}  {module}")
+
+    if shutil.which('sumo') or (os.environ.get('SUMO_HOME') and
+                                os.path.exists(os.path.join(os.environ['SUMO_HOME'], 'bin'))):
+        workdir = tempfile.mkdtemp(prefix='startup_benchmark_')
+        try:
+            first_steps, totals = [], []
+            for _ in range(options.repeat):
+                # Every measured round starts as a first round
+                shutil.rmtree(os.path.join(workdir, 'store'), ignore_errors=True)
+                if os.path.exists(os.path.join(workdir, 'checkpoint.json')):
+                    os.remove(os.path.join(workdir, 'checkpoint.json'))
+                first_step, total = cold_start(options.steps, workdir)
+                first_steps.append(first_step)
+                totals.append(total)
+        finally:
+            shutil.rmtree(workdir)
+        results['first_step_seconds'] = first_steps
+        results['round_seconds'] = totals
+        print(f"launch to first simulation step: median {statistics.median(first_steps) * 1000:.0f} ms, "
+              f"min {min(first_steps) * 1000:.0f} ms over {len(first_steps)} rounds")
+        print(f"whole round of {options.steps} steps: median {statistics.median(totals) * 1000:.0f} ms")
+    else:
+        print("sumo not found, cold start to the first simulation step not measured")
+
+    if options.output:
+        with open(options.output, 'w') as output:
+            json.dump(results, output, indent=4)
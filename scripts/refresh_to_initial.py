@@ -26,3 +26,8 @@ if os.path.exists('dump'):
 if os.path.exists('stats'):
     shutil.rmtree(r'stats')
     print("Folder 'stats' deleted.")
+
+# if a folder 'store' exists, delete it
+if os.path.exists('store'):
+    shutil.rmtree(r'store')
+    print("Folder 'store' deleted.")
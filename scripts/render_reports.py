@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+
+# @author    Muzaffer Citir
+# @date      2026.10.18
+# @location  Berlin, Germany
+# @version   1.0
+
+# @brief   Render the PNG reports (stats/0<HasRun>_*.png) of rounds in the store.
+# Path: scripts/render_reports.py
+import os
+import sys
+import optparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from mobility.reports import render_from_store  # noqa
+from mobility.storage import RoundStore  # noqa
+
+
+def get_options():
+    optParser = optparse.OptionParser()
+    optParser.add_option("--store", default="store",
+                         help="directory of the Parquet files with the results of every round")
+    optParser.add_option("--stats", default="stats",
+                         help="directory the pictures are written to")
+    optParser.add_option("--round", type="int", action="append", dest="rounds", default=None,
+                         help="round (HasRun) to render, can be given more than once (default: the latest round)")
+    optParser.add_option("--all", action="store_true", default=False,
+                         help="render every round of the store")
+    optParser.add_option("--force", action="store_true", default=False,
+                         help="render again the pictures which already exist")
+    optParser.add_option("--max-rows", type="int", default=30,
+                         help="number of rows shown in a picture")
+    options, args = optParser.parse_args()
+    return options
+
+
+if __name__ == "__main__":
+    options = get_options()
+    store = RoundStore(options.store)
+    if options.all:
+        rounds = store.rounds()
+    elif options.rounds:
+        rounds = options.rounds
+    else:
+        rounds = [store.latest_round()] if store.latest_round() is not None else []
+    for has_run in rounds:
+        rendered = render_from_store(store, has_run, options.stats, options.max_rows, options.force)
+        print(f"Round {has_run}: {len(rendered)} reports rendered")
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+
+# @author    Muzaffer Citir
+# @date      2026.10.18
+# @location  Berlin, Germany
+# @version   1.0
+
+# @brief   Evaluate many game events and random seeds at once on all cores.
+# Path: scripts/run_batch.py
+import os
+import sys
+import json
+import optparse
+
+import pandas as pd
+
+# we need to import python modules from the $SUMO_HOME/tools directory
+if 'SUMO_HOME' in os.environ:
+    tools = os.path.join(os.environ['SUMO_HOME'], 'tools')
+    sys.path.append(tools)
+else:
+    sys.exit("please declare environment variable 'SUMO_HOME'")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from sumolib import checkBinary  # noqa
+from mobility.batch import expand_scenarios, run_batch  # noqa
+from mobility.checkpoint import CHECKPOINT_FILE, load_previous_round  # noqa
+from mobility.fleet import ROUTES  # noqa
+
+
+def get_options():
+    optParser = optparse.OptionParser()
+    optParser.add_option("--scenarios", default="batch_scenarios.json",
+                         help="JSON file with the list of scenarios to run")
+    optParser.add_option("--seeds", type="int", default=1,
+                         help="number of random seeds per scenario which does not name its own seed")
+    optParser.add_option("--processes", type="int", default=None,
+                         help="number of sumo instances running at once (default: number of cores)")
+    optParser.add_option("--workdir", default="batch",
+                         help="directory which gets one working directory per scenario")
+    optParser.add_option("--restore", action="store_true", default=False,
+                         help="start every scenario from the last state of the latest round")
+    optParser.add_option("--store", default="store",
+                         help="directory of the Parquet files with the results of every round")
+    optParser.add_option("--checkpoint", default=CHECKPOINT_FILE,
+                         help="file with the end-of-round state used by --restore")
+    options, args = optParser.parse_args()
+    return options
+
+
+if __name__ == "__main__":
+    options = get_options()
+    with open(options.scenarios) as scenario_file:
+        scenarios = expand_scenarios(json.load(scenario_file), options.seeds)
+
+    last_state = None
+    if options.restore:
+        last_state = load_previous_round(ROUTES, options.checkpoint, options.store)
+
+    df_edges, df_timing, throughput = run_batch(scenarios, checkBinary('sumo'), options.workdir,
+                                                options.processes, last_state)
+    pd.DataFrame.to_csv(df_edges, os.path.join(options.workdir, 'edge_stats.csv'), index=False)
+    pd.DataFrame.to_csv(df_timing, os.path.join(options.workdir, 'timing.csv'), index=False)
+    print(f"{throughput['scenarios']} scenarios on {throughput['processes']} processes "
+          f"in {throughput['seconds']:.1f} s: {throughput['scenarios_per_hour']:.0f} scenarios/hour")
@@ -0,0 +1,45 @@
+# @author    Muzaffer Citir
+# @date      2026.10.18
+# @location  Berlin, Germany
+# @version   1.0
+
+# @brief   Shared fixtures of the tests: synthetic SUMO outputs of one round, no SUMO needed.
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from mobility import parsers, synthetic  # noqa
+
+VEHICLES = 20
+STEPS = 11
+EDGES = 8
+
+
+@pytest.fixture
+def edges():
+    return synthetic.make_edges(EDGES)
+
+
+@pytest.fixture
+def round_files(tmp_path, edges):
+    """paths of the synthetic dump, tripinfo and edgeData outputs of one round"""
+    files = {'dump': str(tmp_path / 'dump.xml'), 'tripinfo': str(tmp_path / 'tripinfo.xml'),
+             'dump_edges': str(tmp_path / 'dump_edges.xml'), 'dump_edges_co2': str(tmp_path / 'dump_edges_co2.xml')}
+    synthetic.write_dump(files['dump'], VEHICLES, STEPS, edges)
+    synthetic.write_tripinfo(files['tripinfo'], VEHICLES, STEPS, edges)
+    synthetic.write_edge_data(files['dump_edges'], edges)
+    synthetic.write_edge_data(files['dump_edges_co2'], edges, emissions=True)
+    return files
+
+
+@pytest.fixture
+def round_tables(round_files):
+    """the tables of one round as run.py stores them, every car on route0"""
+    df_tripinfo = parsers.tripinfo_xml_to_df(round_files['tripinfo'])
+    df_tripinfo['onRouteAtStart'] = 'route0'
+    return {'dump': parsers.dump_xml_to_df(round_files['dump']), 'tripinfo': df_tripinfo,
+            'dump_edges': parsers.dump_edges_xml_to_df(round_files['dump_edges']),
+            'dump_edges_co2': parsers.dump_edges_xml_to_df(round_files['dump_edges_co2'])}
@@ -0,0 +1,84 @@
+# @author    Muzaffer Citir
+# @date      2026.10.18
+# @location  Berlin, Germany
+# @version   1.0
+
+# @brief   Running edge aggregates against statistics computed over all rounds at once.
+
+import numpy as np
+import pytest
+
+from mobility import aggregates, parsers, storage, synthetic
+
+
+def edge_tables(tmp_path, edges, seed, n_intervals=1):
+    traffic, emissions = str(tmp_path / f'edges_{seed}.xml'), str(tmp_path / f'co2_{seed}.xml')
+    synthetic.write_edge_data(traffic, edges, n_intervals=n_intervals, seed=seed)
+    synthetic.write_edge_data(emissions, edges, n_intervals=n_intervals, emissions=True, seed=seed)
+    return {'dump_edges': parsers.dump_edges_xml_to_df(traffic),
+            'dump_edges_co2': parsers.dump_edges_xml_to_df(emissions)}
+
+
+def test_mean_and_variance_after_two_rounds(tmp_path, edges):
+    edge_aggregates = aggregates.EdgeAggregates(str(tmp_path / 'edge_aggregates.parquet'))
+    rounds = [edge_tables(tmp_path, edges, seed) for seed in (1, 2)]
+    assert edge_aggregates.update(rounds[0], 1)
+    assert edge_aggregates.update(rounds[1], 2)
+    df = edge_aggregates.read()
+    assert df.attrs['HasRun'] == 2
+    for table, metrics in aggregates.METRICS.items():
+        for metric in metrics:
+            values = np.array([tables[table].set_index(tables[table]['id'].astype(str))[metric].loc[edges].values
+                               for tables in rounds])
+            result = df.loc[edges]
+            np.testing.assert_allclose(result[f'{metric}_mean'], values.mean(axis=0))
+            np.testing.assert_allclose(result[f'{metric}_var'], values.var(axis=0, ddof=1))
+            np.testing.assert_allclose(result[f'{metric}_min'], values.min(axis=0))
+            np.testing.assert_allclose(result[f'{metric}_max'], values.max(axis=0))
+            np.testing.assert_allclose(result[f'{metric}_last'], values[1])
+            assert (result[f'{metric}_count'] == 2).all()
+
+
+def test_a_round_is_only_counted_once(tmp_path, edges):
+    edge_aggregates = aggregates.EdgeAggregates(str(tmp_path / 'edge_aggregates.parquet'))
+    tables = edge_tables(tmp_path, edges, 1)
+    assert edge_aggregates.update(tables, 1)
+    assert not edge_aggregates.update(tables, 1)
+    assert (edge_aggregates.read()['speed_count'] == 1).all()
+
+
+def test_rebuild_from_the_store(tmp_path, edges):
+    store = storage.RoundStore(str(tmp_path / 'store'))
+    incremental = aggregates.EdgeAggregates(str(tmp_path / 'incremental.parquet'))
+    for has_run, seed in ((1, 1), (2, 2), (3, 3)):
+        tables = edge_tables(tmp_path, edges, seed)
+        store.write_round(tables, has_run)
+        incremental.update(tables, has_run)
+    rebuilt = aggregates.EdgeAggregates(str(tmp_path / 'rebuilt.parquet'))
+    rebuilt.rebuild(store)
+    np.testing.assert_allclose(rebuilt.read().loc[edges, 'density_var'], incremental.read().loc[edges, 'density_var'])
+
+
+def test_several_intervals_give_one_row_per_edge(tmp_path, edges):
+    tables = edge_tables(tmp_path, edges, 1, n_intervals=3)
+    values = aggregates.round_metrics(tables)
+    assert values.index.is_unique and sorted(values.index) == sorted(edges)
+    traffic = tables['dump_edges'].assign(id=tables['dump_edges']['id'].astype(str))
+    assert values.loc[edges[0], 'timeLoss'] == pytest.approx(traffic.loc[traffic['id'] == edges[0], 'timeLoss'].sum())
+    assert values.loc[edges[0], 'speed'] == pytest.approx(traffic.loc[traffic['id'] == edges[0], 'speed'].mean())
+
+
+def test_a_round_without_traffic(tmp_path, edges):
+    # With excludeEmpty an edgeData file of a round without traffic has no <edge> rows
+    empty = str(tmp_path / 'empty.xml')
+    with open(empty, 'w') as output:
+        output.write('<meandata><interval begin="0" end="10" id="dump_edges"></interval></meandata>')
+    tables = {table: parsers.dump_edges_xml_to_df(empty) for table in aggregates.METRICS}
+    assert aggregates.round_metrics(tables).empty
+    edge_aggregates = aggregates.EdgeAggregates(str(tmp_path / 'edge_aggregates.parquet'))
+    assert edge_aggregates.update(tables, 1)
+    assert edge_aggregates.update(edge_tables(tmp_path, edges, 1), 2)
+    assert edge_aggregates.update(tables, 3)
+    df = edge_aggregates.read()
+    assert df.attrs['HasRun'] == 3
+    assert (df.loc[edges, 'speed_count'] == 1).all() and (df.loc[edges, 'lastSeen'] == 2).all()
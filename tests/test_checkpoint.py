@@ -0,0 +1,59 @@
+# @author    Muzaffer Citir
+# @date      2026.10.18
+# @location  Berlin, Germany
+# @version   1.0
+
+# @brief   Round trips through the end-of-round checkpoint.
+
+import random
+
+from conftest import VEHICLES
+from mobility import checkpoint, fleet, storage
+
+
+def test_write_read_round_trip(tmp_path):
+    checkpoint_file = str(tmp_path / 'store' / 'checkpoint.json')
+    continuing = [fleet.Vehicle('car0', 'route0', 1, 'E12_0', 12.345, 7.891),
+                  fleet.Vehicle('car3', 'route1', 0, '-E7_1', 0.0, 0.0)]
+    rng = random.Random(7)
+    rng.random()
+    written = checkpoint.make_checkpoint(4, continuing, ['car0', 'car1', 'car2', 'car3'], rng.getstate(),
+                                         ['passenger1', 'truck1', 'passenger1', 'truck1'])
+    checkpoint.write_checkpoint(written, checkpoint_file)
+    read = checkpoint.read_checkpoint(checkpoint_file)
+    assert read['HasRun'] == 4
+    assert read['fleet'] == ['car0', 'car1', 'car2', 'car3']
+    assert read['vtypes'] == ['passenger1', 'truck1', 'passenger1', 'truck1']
+    # Positions and speeds are kept with the two decimals of SUMO
+    assert read['vehicles'] == [fleet.Vehicle('car0', 'route0', 1, 'E12_0', 12.35, 7.89),
+                                fleet.Vehicle('car3', 'route1', 0, '-E7_1', 0.0, 0.0)]
+
+
+def test_rng_state_continues_the_draws(tmp_path):
+    checkpoint_file = str(tmp_path / 'checkpoint.json')
+    rng = random.Random(42)
+    rng.random()
+    checkpoint.write_checkpoint(checkpoint.make_checkpoint(1, [], [], rng.getstate()), checkpoint_file)
+    expected = [rng.random() for _ in range(5)]
+    restored = random.Random()
+    restored.setstate(checkpoint.read_checkpoint(checkpoint_file)['rng_state'])
+    assert [restored.random() for _ in range(5)] == expected
+
+
+def test_no_checkpoint(tmp_path, monkeypatch):
+    # The csv files of earlier versions are looked up in csv/ of the working directory
+    monkeypatch.chdir(tmp_path)
+    assert checkpoint.read_checkpoint(str(tmp_path / 'checkpoint.json')) is None
+    assert checkpoint.load_previous_round(fleet.ROUTES, str(tmp_path / 'checkpoint.json'),
+                                          str(tmp_path / 'store')) is None
+
+
+def test_falls_back_to_the_store(tmp_path, round_tables, edges):
+    store_root = str(tmp_path / 'store')
+    storage.RoundStore(store_root).write_round(round_tables, 3)
+    previous_round = checkpoint.load_previous_round({'route0': edges}, str(tmp_path / 'checkpoint.json'), store_root)
+    assert previous_round['HasRun'] == 3
+    assert len(previous_round['fleet']) == VEHICLES
+    assert previous_round['rng_state'] is None
+    # Every synthetic car is on an edge of route0 at the last step
+    assert len(previous_round['vehicles']) == VEHICLES
@@ -0,0 +1,81 @@
+# @author    Muzaffer Citir
+# @date      2026.10.18
+# @location  Berlin, Germany
+# @version   1.0
+
+# @brief   Fleet generation from a demand and the planning of the next round.
+
+import random
+
+import pytest
+
+from mobility import fleet
+from mobility.routing import RouteLibrary
+
+DEMAND = {'size': 200,
+          'vtypes': [dict(fleet.VTYPE, weight=0.75), {'id': 'truck1', 'length': 12, 'weight': 0.25}],
+          'depart': {'begin': 0, 'end': 100, 'distribution': 'poisson'},
+          'depart_pos': 'random'}
+
+
+@pytest.fixture
+def library():
+    return RouteLibrary(list(fleet.ROUTES), list(fleet.ROUTES.values()), [10.0, 10.0, 10.0],
+                        edge_lengths={edge: 50.0 for edges in fleet.ROUTES.values() for edge in edges})
+
+
+def test_sampling_follows_the_demand(library):
+    vehicles = fleet.first_round_vehicles(library=library, rng=random.Random(1), demand=DEMAND)
+    assert [vehicle.carID for vehicle in vehicles] == [f'car{car}' for car in range(DEMAND['size'])]
+    assert {vehicle.vtype for vehicle in vehicles} == {'passenger1', 'truck1'}
+    assert {vehicle.route for vehicle in vehicles} <= set(fleet.ROUTES)
+    assert all(0 <= vehicle.depart <= 100 and 0 <= vehicle.pos <= 50 for vehicle in vehicles)
+
+
+def test_sampling_is_replayed_from_the_random_state(library):
+    rng = random.Random(5)
+    state = rng.getstate()
+    first = fleet.first_round_vehicles(library=library, rng=rng, demand=DEMAND)
+    rng.setstate(state)
+    assert fleet.first_round_vehicles(library=library, rng=rng, demand=DEMAND) == first
+
+
+def test_continuing_cars_keep_route_and_vtype(library):
+    continuing = [fleet.Vehicle('car0', 'route0', 1, 'E12_0', 3.0, 5.0)]
+    vehicles = fleet.next_round_vehicles(continuing, ['car0', 'car1'], fleet.ROUTES, random.Random(1), library,
+                                         DEMAND, {'car0': 'truck1', 'car1': 'truck1'})
+    assert vehicles[0] == continuing[0]._replace(vtype='truck1')
+    assert vehicles[1].vtype == 'truck1' and vehicles[1].edge is None
+
+
+def test_unknown_vtypes_fall_back_to_the_default():
+    # Without a demand the route file only has the default vType
+    continuing = [fleet.Vehicle('car0', 'route0', 1, 'E12_0', 3.0, 5.0)]
+    vehicles = fleet.next_round_vehicles(continuing, ['car0', 'car1'], fleet.ROUTES, random.Random(1),
+                                         vtypes={'car0': 'truck1', 'car1': 'truck1'})
+    assert [vehicle.vtype for vehicle in vehicles] == [None, None]
+
+
+def test_fleet_follows_the_demand_size():
+    carIDs = ['car0', 'car1', 'car2']
+    assert fleet.fleet_carIDs(carIDs) == carIDs
+    assert fleet.fleet_carIDs(carIDs, dict(DEMAND, size=5)) == carIDs + ['car3', 'car4']
+    assert fleet.fleet_carIDs(carIDs, dict(DEMAND, size=2)) == ['car0', 'car1']
+
+
+def test_route_file_defines_every_vtype(tmp_path, library):
+    route_file = str(tmp_path / 'straight.rou.xml')
+    vehicles = fleet.first_round_vehicles(library=library, rng=random.Random(1), demand=DEMAND)
+    fleet.write_routefile(route_file, fleet.ROUTES, vehicles, 'tests', vtypes=fleet.demand_vtypes(DEMAND))
+    content = open(route_file).read()
+    assert content.count('<vehicle ') == DEMAND['size']
+    assert '<vType id="truck1"' in content and 'weight' not in content
+
+
+def test_grown_fleet_has_no_duplicate_carIDs():
+    # The store returns the fleet in dump order, with gaps after the fleet has shrunk
+    carIDs = fleet.fleet_carIDs(['car1', 'car2', 'car0', 'car4', 'car7', 'car3'], dict(DEMAND, size=5))
+    carIDs = fleet.fleet_carIDs(carIDs, dict(DEMAND, size=10))
+    assert len(carIDs) == len(set(carIDs)) == 10
+    assert carIDs[:5] == ['car1', 'car2', 'car0', 'car4', 'car7']
+    assert carIDs[5:] == ['car8', 'car9', 'car10', 'car11', 'car12']
@@ -0,0 +1,116 @@
+# @author    Muzaffer Citir
+# @date      2026.10.18
+# @location  Berlin, Germany
+# @version   1.0
+
+# @brief   Frames written by the FeedWriter and read back as the game client does.
+
+import os
+
+import numpy as np
+import pytest
+import traci.constants as tc
+
+from mobility.livefeed import FeedReader, FeedWriter, LiveFeed
+
+EDGE_IDS = ['E0', 'E1', 'E2']
+EDGE_LENGTHS = [100.0, 250.0, 0.0]
+
+
+def results(step, vehicles=4):
+    # Subscription results as traci.vehicle.getAllSubscriptionResults() returns them
+    return {f'car{car}': {tc.VAR_ROAD_ID: EDGE_IDS[car % 2] if car < 3 else ':J0_0', tc.VAR_LANE_ID: '',
+                          tc.VAR_SPEED: float(car + step), tc.VAR_POSITION: (float(car), float(step)),
+                          tc.VAR_ANGLE: 90.0, tc.VAR_CO2EMISSION: 10.0 * car}
+            for car in range(vehicles)}
+
+
+@pytest.fixture
+def feed_file(tmp_path):
+    return str(tmp_path / 'dump' / 'live.feed')
+
+
+def test_frame_round_trip(feed_file):
+    writer = FeedWriter(feed_file, EDGE_IDS, EDGE_LENGTHS, max_vehicles=10, has_run=3)
+    LiveFeed(writer).publish(5, 6.0, results(5))
+    reader = FeedReader(feed_file)
+    assert reader.edge_ids == EDGE_IDS and reader.generation() == 1
+    frame, edge_states, vehicle_states = reader.read()
+    assert (frame['seq'], frame['step'], frame['time'], frame['vehicles']) == (1, 5, 6.0, 4)
+    assert vehicle_states['id'].tolist() == [b'car0', b'car1', b'car2', b'car3']
+    # car3 is on a junction, which is not in the edge table
+    assert vehicle_states['edge'].tolist() == [0, 1, 0, -1]
+    assert vehicle_states['speed'].tolist() == [5.0, 6.0, 7.0, 8.0]
+    assert edge_states['vehicles'].tolist() == [2, 1, 0]
+    np.testing.assert_allclose(edge_states['density'], [20.0, 4.0, 0.0])
+    np.testing.assert_allclose(edge_states['speed'], [6.0, 6.0, 0.0])
+    np.testing.assert_allclose(edge_states['co2'], [20.0, 10.0, 0.0])
+    assert not reader.ended()
+    writer.close()
+    assert reader.ended()
+    reader.close()
+
+
+def test_overwritten_frames_are_gone(feed_file):
+    writer = FeedWriter(feed_file, EDGE_IDS, EDGE_LENGTHS, max_vehicles=10, slots=4)
+    reader = FeedReader(feed_file)
+    assert reader.read() is None
+    feed = LiveFeed(writer)
+    for step in range(10):
+        feed.publish(step, float(step), results(step))
+    assert reader.latest_seq() == 10
+    assert reader.read()[0]['step'] == 9
+    assert reader.read(7)[0]['step'] == 6
+    # Frame 6 shared its slot with frame 10
+    assert reader.read(6) is None and reader.read(11) is None
+    writer.close()
+    reader.close()
+
+
+def test_vehicles_beyond_the_feed_are_counted(feed_file):
+    writer = FeedWriter(feed_file, EDGE_IDS, EDGE_LENGTHS, max_vehicles=2)
+    LiveFeed(writer).publish(0, 0.0, results(0))
+    reader = FeedReader(feed_file)
+    frame, edge_states, vehicle_states = reader.read()
+    assert (frame['vehicles'], frame['total_vehicles']) == (2, 4)
+    assert len(vehicle_states) == 2 and edge_states['vehicles'].sum() == 3
+    writer.close()
+    reader.close()
+
+
+def test_empty_frame(feed_file):
+    writer = FeedWriter(feed_file, EDGE_IDS, EDGE_LENGTHS, max_vehicles=2)
+    LiveFeed(writer).publish(0, 0.0, {})
+    reader = FeedReader(feed_file)
+    frame, edge_states, vehicle_states = reader.read()
+    assert frame['vehicles'] == 0 and len(vehicle_states) == 0
+    assert edge_states['vehicles'].sum() == 0
+    writer.close()
+    reader.close()
+
+
+def test_next_round_writes_into_the_same_file(feed_file):
+    writer = FeedWriter(feed_file, EDGE_IDS, EDGE_LENGTHS, max_vehicles=10, slots=4, has_run=1)
+    LiveFeed(writer).publish(0, 0.0, results(0))
+    writer.close()
+    reader = FeedReader(feed_file)
+    inode = os.stat(feed_file).st_ino
+    writer = FeedWriter(feed_file, EDGE_IDS, EDGE_LENGTHS, max_vehicles=10, slots=4, has_run=2)
+    assert os.stat(feed_file).st_ino == inode and not reader.replaced()
+    LiveFeed(writer).publish(0, 0.0, results(0))
+    assert reader.generation() == 2 and not reader.ended()
+    frame = reader.read()[0]
+    assert (frame['seq'], frame['generation']) == (2, 2)
+    writer.close()
+    # Another layout needs a new file
+    writer = FeedWriter(feed_file, EDGE_IDS, EDGE_LENGTHS, max_vehicles=20, slots=4, has_run=3)
+    assert reader.replaced()
+    writer.close()
+    reader.close()
+
+
+def test_long_carID_is_rejected(feed_file):
+    writer = FeedWriter(feed_file, EDGE_IDS, EDGE_LENGTHS, max_vehicles=10, vehicle_id_width=4)
+    with pytest.raises(ValueError):
+        LiveFeed(writer).publish(0, 0.0, {'car10': results(0)['car1']})
+    writer.close()
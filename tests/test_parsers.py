@@ -0,0 +1,86 @@
+# @author    Muzaffer Citir
+# @date      2026.10.18
+# @location  Berlin, Germany
+# @version   1.0
+
+# @brief   The streaming parsers against ElementTree on synthetic SUMO outputs.
+
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pandas as pd
+
+from conftest import STEPS, VEHICLES
+from mobility import parsers
+
+
+def test_dump_columns_and_dtypes(round_files):
+    df = parsers.dump_xml_to_df(round_files['dump'])
+    assert list(df.columns) == parsers.DUMP_COLUMNS
+    assert len(df) == VEHICLES * STEPS
+    for column in ('carID', 'edgeID', 'laneID'):
+        assert isinstance(df[column].dtype, pd.CategoricalDtype)
+    for column in ('time', 'pos', 'speed'):
+        assert df[column].dtype == np.float64
+
+
+def test_dump_values_match_the_xml(round_files):
+    df = parsers.dump_xml_to_df(round_files['dump'])
+    rows = []
+    for timestep in ET.parse(round_files['dump']).getroot():
+        for edge in timestep:
+            for lane in edge:
+                for vehicle in lane:
+                    rows.append((float(timestep.attrib['time']), vehicle.attrib['id'], edge.attrib['id'],
+                                 lane.attrib['id'], float(vehicle.attrib['pos']), float(vehicle.attrib['speed'])))
+    assert list(df.astype(object).itertuples(index=False, name=None)) == rows
+
+
+def test_tripinfo_dtypes(round_files):
+    df = parsers.tripinfo_xml_to_df(round_files['tripinfo'])
+    assert list(df.columns) == [column for column, _, _ in parsers.TRIPINFO_SCHEMA]
+    assert len(df) == VEHICLES
+    for column, _, kind in parsers.TRIPINFO_SCHEMA:
+        if kind == 'category':
+            assert isinstance(df[column].dtype, pd.CategoricalDtype), column
+        elif kind == 'int':
+            assert df[column].dtype == np.int64, column
+        else:
+            assert df[column].dtype == np.float64, column
+
+
+def test_edge_data_counts_are_integers(round_files, edges):
+    df = parsers.dump_edges_xml_to_df(round_files['dump_edges'])
+    assert df['id'].astype(str).tolist() == edges
+    assert df['departed'].dtype == np.int64
+    assert df['density'].dtype == np.float64
+    df_co2 = parsers.dump_edges_xml_to_df(round_files['dump_edges_co2'])
+    assert 'CO2_abs' in df_co2.columns and df_co2['CO2_abs'].dtype == np.float64
+
+
+def test_missing_attributes_become_nan(tmp_path):
+    xml_file = tmp_path / 'edges.xml'
+    xml_file.write_text('<meandata><interval begin="0" end="1">'
+                        '<edge id="a" density="1.5" departed="2"/><edge id="b"/>'
+                        '</interval></meandata>')
+    df = parsers.dump_edges_xml_to_df(str(xml_file))
+    assert df['id'].astype(str).tolist() == ['a', 'b']
+    assert df['density'].iloc[0] == 1.5 and np.isnan(df['density'].iloc[1])
+    # An integer column with a missing value falls back to floats
+    assert df['departed'].dtype == np.float64
+
+
+def test_stats_chunks_match_one_join(round_tables):
+    df_dump, df_trips = round_tables['dump'], round_tables['tripinfo']
+    chunks = list(parsers.iter_stats(df_dump, df_trips, 3, chunk_rows=7))
+    assert len(chunks) == -(-len(df_dump) // 7)
+    df = pd.concat(chunks, ignore_index=True)
+    expected = pd.merge(df_dump, df_trips, on='carID', how='left')[parsers.STATS_COLUMNS + ['onRouteAtStart']]
+    expected.insert(len(parsers.STATS_COLUMNS), 'HasRun', 3)
+    pd.testing.assert_frame_equal(df.astype(str), expected.astype(str))
+
+
+def test_stats_of_an_empty_round(round_tables):
+    chunks = list(parsers.iter_stats(round_tables['dump'].iloc[:0], round_tables['tripinfo'], 1))
+    assert len(chunks) == 1 and chunks[0].empty
+    assert list(chunks[0].columns) == parsers.STATS_COLUMNS + ['HasRun', 'onRouteAtStart']
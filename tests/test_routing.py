@@ -0,0 +1,74 @@
+# @author    Muzaffer Citir
+# @date      2026.10.18
+# @location  Berlin, Germany
+# @version   1.0
+
+# @brief   Route library of straight.net.xml: origins and destinations, sampling and the cache.
+
+import os
+import random
+
+import pytest
+
+from mobility import routing
+
+NET_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'straight.net.xml')
+DEAD_ENDS = {'91': ('-E0', 'E0'), 'J1': ('E2', '-E2'), 'J2': ('E3', '-E3'), 'J4': ('E5', '-E5'),
+             'J5': ('E6', '-E6'), 'J6': ('E7', '-E7')}
+
+
+@pytest.fixture
+def turnaround_net(tmp_path):
+    # straight.net.xml with a turnaround at every dead end, as netconvert builds them by default
+    net = open(NET_FILE).read()
+    turnarounds = ''.join(f'    <connection from="{into}" to="{out}" fromLane="0" toLane="0" dir="t" state="M"/>\n'
+                          for into, out in DEAD_ENDS.values())
+    net_file = str(tmp_path / 'turnaround.net.xml')
+    with open(net_file, 'w') as output:
+        output.write(net.replace('</net>', turnarounds + '</net>'))
+    return net_file
+
+
+def test_routes_between_the_dead_ends():
+    route_ids, route_edges, travel_times, edge_lengths = routing.build_routes(NET_FILE)
+    origins = {out for _, out in DEAD_ENDS.values()}
+    destinations = {into for into, _ in DEAD_ENDS.values()}
+    assert len(route_ids) == len(origins) * (len(destinations) - 1)
+    for route, edges in zip(route_ids, route_edges):
+        assert route == f'{edges[0]}_to_{edges[-1]}'
+        assert edges[0] in origins and edges[-1] in destinations
+    assert all(time > 0 for time in travel_times)
+    assert edge_lengths['E2'] == pytest.approx(100.0)
+
+
+def test_turnarounds_keep_the_dead_ends(turnaround_net):
+    route_edges = routing.build_routes(turnaround_net)[1]
+    # A turnaround makes more destinations reachable, but the dead ends stay origins and destinations
+    assert {edges[0] for edges in route_edges} == {out for _, out in DEAD_ENDS.values()}
+    assert {edges[-1] for edges in route_edges} == {into for into, _ in DEAD_ENDS.values()}
+    assert len(route_edges) >= len(routing.build_routes(NET_FILE)[1])
+
+
+def test_routes_between_given_endpoints():
+    route_ids = routing.build_routes(NET_FILE, endpoints=['E0', '-E0', 'E7', '-E7'])[0]
+    assert route_ids == ['-E7_to_-E0', 'E0_to_E7']
+    with pytest.raises(ValueError):
+        routing.build_routes(NET_FILE, endpoints=['E0', 'X1'])
+
+
+def test_empty_library_cannot_be_sampled():
+    with pytest.raises(ValueError):
+        routing.RouteLibrary([], [], []).sample(3)
+
+
+def test_cache_round_trip(tmp_path):
+    library = routing.load_route_library(NET_FILE, str(tmp_path))
+    cache_files = os.listdir(str(tmp_path))
+    assert len(cache_files) == 1
+    cached = routing.RouteLibrary.load(str(tmp_path / cache_files[0]))
+    assert cached.route_ids == library.route_ids and cached.routes == library.routes
+    assert cached.edge_lengths == pytest.approx(library.edge_lengths)
+    assert cached.sample(50, random.Random(3)) == library.sample(50, random.Random(3))
+    # Other endpoints are cached in a file of their own
+    routing.load_route_library(NET_FILE, str(tmp_path), endpoints=['E0', 'E7'])
+    assert len(os.listdir(str(tmp_path))) == 2
@@ -0,0 +1,77 @@
+# @author    Muzaffer Citir
+# @date      2026.10.18
+# @location  Berlin, Germany
+# @version   1.0
+
+# @brief   Round trips through the Parquet round store.
+
+import pandas as pd
+import pyarrow.dataset as ds
+
+from conftest import VEHICLES
+from mobility import storage
+
+
+def test_write_round_read_back(tmp_path, round_tables):
+    store = storage.RoundStore(str(tmp_path / 'store'))
+    store.write_round(round_tables, 1)
+    store.write_round(round_tables, 2)
+    assert store.rounds() == [1, 2]
+    assert store.latest_round() == 2
+    df = store.read('dump', 2)
+    assert (df['HasRun'] == 2).all()
+    pd.testing.assert_frame_equal(df.drop(columns=['HasRun']).astype(str), round_tables['dump'].astype(str))
+    assert len(store.read('dump')) == 2 * len(round_tables['dump'])
+
+
+def test_read_filters_on_time(tmp_path, round_tables):
+    store = storage.RoundStore(str(tmp_path / 'store'))
+    store.write_round(round_tables, 1)
+    df = store.read('dump', 1, where=ds.field('time') == 3.0)
+    assert len(df) == VEHICLES and (df['time'] == 3.0).all()
+    assert store.column_max('dump', 1, 'time') == round_tables['dump']['time'].max()
+
+
+def test_last_state(tmp_path, round_tables):
+    store = storage.RoundStore(str(tmp_path / 'store'))
+    store.write_round(round_tables, 1)
+    df_last = store.last_state(1)
+    df_dump = round_tables['dump']
+    expected = df_dump.loc[df_dump['time'] == df_dump['time'].max()]
+    assert len(df_last) == len(expected)
+    assert sorted(df_last['carID'].astype(str)) == sorted(expected['carID'].astype(str))
+    assert (df_last['onRouteAtStart'] == 'route0').all()
+    assert (df_last['time'] == df_dump['time'].max()).all()
+
+
+def test_load_previous_round(tmp_path, round_tables):
+    store = storage.RoundStore(str(tmp_path / 'store'))
+    assert storage.load_previous_round(store, str(tmp_path / 'csv')) is None
+    store.write_round(round_tables, 1)
+    has_run, df_last, carIDs = storage.load_previous_round(store, str(tmp_path / 'csv'))
+    assert has_run == 1
+    assert sorted(carIDs) == sorted(f'car{car}' for car in range(VEHICLES))
+
+
+def test_stats_from_the_store(tmp_path, round_tables):
+    store = storage.RoundStore(str(tmp_path / 'store'))
+    store.write_round(round_tables, 1)
+    chunks = list(store.iter_stats(1, batch_size=50))
+    assert len(chunks) > 1
+    df = store.stats(1)
+    assert len(df) == len(round_tables['dump']) == sum(len(chunk) for chunk in chunks)
+    assert (df['HasRun'] == 1).all() and (df['onRouteAtStart'] == 'route0').all()
+
+
+def test_export_csv_in_chunks(tmp_path, round_tables, monkeypatch):
+    # Small chunks so that the joined table is appended to both files several times
+    iter_stats = storage.iter_stats
+    monkeypatch.setattr(storage, 'iter_stats', lambda *args: iter_stats(*args, chunk_rows=30))
+    directory = str(tmp_path / 'csv')
+    storage.export_csv(round_tables, 2, directory)
+    latest = pd.read_csv(tmp_path / 'csv' / 'simulationStats.csv')
+    history = pd.read_csv(tmp_path / 'csv' / 'history' / '02_simulationStats.csv')
+    assert len(latest) == len(round_tables['dump'])
+    pd.testing.assert_frame_equal(latest, history)
+    assert (latest['HasRun'] == 2).all()
+    assert (tmp_path / 'csv' / 'history' / '02_tripinfo.csv').exists()
\ No newline at end of file